@@ -1,6 +1,7 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
 from app.core.security import create_access_token, get_current_user
+from app.core.user_cache import user_cache
 from app.models.user import User
 from app.schemas.token import Token
 from datetime import timedelta
@@ -34,4 +35,10 @@ async def refresh_token(current_user: User = Depends(get_current_user)):
     access_token = create_access_token(
         data={"sub": current_user.username}, expires_delta=access_token_expires
     )
-    return {"access_token": access_token, "token_type": "bearer"}
\ No newline at end of file
+    return {"access_token": access_token, "token_type": "bearer"}
+
+@router.get("/cache/stats")
+async def user_cache_stats(current_user: User = Depends(get_current_user)):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return user_cache.stats()
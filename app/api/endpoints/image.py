@@ -25,11 +25,10 @@ image_generator = ImageGenerator(image_generator_func=image_gen_func)
 
 @router.get("/images/tasks/{task_id}", response_model=ImageTaskStatus)
 async def get_task_status(task_id: str, current_user: dict = Depends(get_current_user)):
-    task = await VideoTask.get(task_id)
+    task = await VideoTask.get_with_images(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    images = await Image.list_by_task(task_id)
     return ImageTaskStatus(
         task_id=task.id,
         status=task.status,
@@ -43,7 +42,7 @@ async def get_task_status(task_id: str, current_user: dict = Depends(get_current
             subtitles=image.subtitles,
             created_at=image.created_at,
             updated_at=image.updated_at if image.updated_at else None
-        ) for image in images]
+        ) for image in task.images]
     )
 
 @router.post("/images/{image_id}", response_model=RegenerateImageResponse, status_code=status.HTTP_200_OK)
@@ -0,0 +1,12 @@
+from fastapi import APIRouter, Depends, HTTPException, status
+from app.core.security import get_current_user
+from app.db.session import query_metrics
+from app.models.user import User
+
+router = APIRouter()
+
+@router.get("/metrics/db")
+async def db_query_metrics(current_user: User = Depends(get_current_user)):
+    if not current_user.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return query_metrics.snapshot()
@@ -1,27 +1,36 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, HTTPException
+import json
+import asyncio
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from app.schemas.video import VideoRequest, VideoResponse, VideoTaskStatus
 from app.core.security import get_current_user
 from app.models.video_task import VideoTask
-from app.services.video_task_processor import VideoTaskProcessor
+from app.services.progress_events import progress_broker
+from app.core.config import settings
 from uuid import uuid4
-from app.models.image import Image
 from app.schemas.image import ImageStatus
 import logging
 from pydantic import ValidationError
 
 router = APIRouter()
-video_task_processor = VideoTaskProcessor()
+
+TERMINAL_STATUSES = ("completed", "failed")
+
+
+def format_sse(event: dict) -> str:
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
 
 @router.post("/video", response_model=VideoResponse)
 async def generate_video(
     request: VideoRequest,
-    background_tasks: BackgroundTasks,
     current_user: dict = Depends(get_current_user)
 ):
     try:
         task_id = str(uuid4())
         
-        await VideoTask.create(
+        # The task is picked up from the queue by a render worker (python -m app.worker)
+        task = await VideoTask.create(
             id=task_id, 
             status="queued", 
             progress=0.0, 
@@ -31,18 +40,12 @@ async def generate_video(
             language=request.language,
             voice_name=request.voice_name
         )
-        
-        background_tasks.add_task(
-            video_task_processor.process_video_generation_task,
-            task_id,
-            request.story_topic,
-            request.art_style,
-            request.duration,
-            request.language,
-            request.voice_name
-        )
+        if not task:
+            raise HTTPException(status_code=500, detail="Failed to queue video task")
         
         return VideoResponse(task_id=task_id, status="queued")
+    except HTTPException:
+        raise
     except ValidationError as e:
         logging.error(f"Validation error: {str(e)}")
         raise HTTPException(status_code=422, detail=str(e))
@@ -52,10 +55,9 @@ async def generate_video(
 
 @router.get("/video/tasks/{task_id}", response_model=VideoTaskStatus)
 async def get_task_status(task_id: str, current_user: dict = Depends(get_current_user)):
-    task = await VideoTask.get(task_id)
+    task = await VideoTask.get_with_images(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
-    images = await Image.list_by_task(task_id)
     return VideoTaskStatus(
         task_id=task.id,
         status=task.status,
@@ -72,7 +74,65 @@ async def get_task_status(task_id: str, current_user: dict = Depends(get_current
             subtitles=image.subtitles,
             created_at=image.created_at,
             updated_at=image.updated_at
-        ) for image in images],
+        ) for image in task.images],
         created_at=task.created_at,
         updated_at=task.updated_at
     )
+
+
+@router.post("/video/tasks/{task_id}/resume", response_model=VideoResponse)
+async def resume_task(task_id: str, current_user: dict = Depends(get_current_user)):
+    """
+    Requeue a failed task. It continues from its last checkpoint instead of
+    regenerating the story, storyboard and images.
+    """
+    task = await VideoTask.requeue_failed(task_id, (settings.worker or {}).get('lease_timeout', 120))
+    if not task:
+        if not await VideoTask.get(task_id):
+            raise HTTPException(status_code=404, detail="Task not found")
+        raise HTTPException(status_code=409, detail="Only failed tasks that no worker is still running can be resumed")
+    return VideoResponse(task_id=task_id, status="queued")
+
+
+@router.get("/video/tasks/{task_id}/events")
+async def stream_task_events(task_id: str, request: Request, current_user: dict = Depends(get_current_user)):
+    """
+    Server-Sent Events stream of a task's progress: status changes, step
+    transitions, per-image completions and render percentages. The stream
+    starts with a snapshot of the task and ends once it completes or fails.
+    """
+    keepalive_interval = (settings.progress_events or {}).get('keepalive_interval', 15)
+
+    async def event_stream():
+        # Subscribe before reading the snapshot so no event falls in between
+        async with progress_broker.subscribe(task_id) as queue:
+            task = await VideoTask.get(task_id)
+            if not task:
+                yield format_sse({"type": "error", "task_id": task_id, "detail": "Task not found"})
+                return
+            yield format_sse({
+                "type": "snapshot",
+                "task_id": task.id,
+                "status": task.status,
+                "progress": task.progress,
+                "url": task.url,
+                "error_message": task.error_message,
+            })
+            if task.status in TERMINAL_STATUSES:
+                return
+
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=keepalive_interval)
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                yield format_sse(event)
+                if event["type"] == "status" and event.get("status") in TERMINAL_STATUSES:
+                    return
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
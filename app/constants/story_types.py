@@ -14,3 +14,6 @@ STORY_TYPES: List[str] = [
     "love",
     "custom topic",
 ]
+
+# Story types whose content has no recurring characters to describe
+STORY_TYPES_WITHOUT_CHARACTERS: List[str] = ["life pro tips", "fun facts"]
@@ -4,6 +4,7 @@ from jose import JWTError, jwt
 from pydantic import BaseModel
 from datetime import datetime, timedelta
 from app.core.config import settings
+from app.core.user_cache import user_cache, CACHE_MISS
 import bcrypt
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="v1/auth/token")
@@ -37,8 +38,11 @@ async def get_current_user(token: str = Depends(oauth2_scheme)):
     except JWTError:
         raise credentials_exception
     
-    user = await User.get_by_username(token_data.username)
-    if user is None:
+    user = user_cache.get(token_data.username) if user_cache.enabled else CACHE_MISS
+    if user is CACHE_MISS:
+        user = await User.get_by_username(token_data.username)
+        user_cache.put(token_data.username, user)
+    if user is None or not user.is_active:
         raise credentials_exception
     return user
 
@@ -0,0 +1,74 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.core.config import settings
+
+CACHE_MISS = object()
+
+
+class UserCache:
+    """
+    In-process TTL cache of users by username for request authentication.
+
+    Found users are kept for `ttl` seconds and unknown usernames for
+    `negative_ttl` seconds (0 disables negative caching). The least recently
+    used entry is dropped once `max_size` is reached. Anything that changes a
+    user must call invalidate() so the next request reloads it.
+    """
+
+    def __init__(self, ttl: Optional[float] = None, negative_ttl: Optional[float] = None, max_size: Optional[int] = None):
+        auth_config = settings.auth or {}
+        self.ttl = ttl if ttl is not None else auth_config.get('user_cache_ttl', 60)
+        self.negative_ttl = negative_ttl if negative_ttl is not None else auth_config.get('user_cache_negative_ttl', 10)
+        self.max_size = max_size if max_size is not None else auth_config.get('user_cache_max_size', 1024)
+        self._entries: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def get(self, username: str) -> Any:
+        """
+        Return the cached user, None for a cached unknown username, or CACHE_MISS.
+        """
+        entry = self._entries.get(username)
+        if entry is None or entry[0] <= time.monotonic():
+            if entry is not None:
+                del self._entries[username]
+            self.misses += 1
+            return CACHE_MISS
+        self._entries.move_to_end(username)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, username: str, user: Any) -> None:
+        ttl = self.ttl if user is not None else self.negative_ttl
+        if ttl <= 0:
+            return
+        self._entries[username] = (time.monotonic() + ttl, user)
+        self._entries.move_to_end(username)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, username: Optional[str] = None) -> None:
+        """
+        Drop one username, or everything when called without one.
+        """
+        if username is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(username, None)
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "size": len(self._entries),
+        }
+
+
+user_cache = UserCache()
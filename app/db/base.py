@@ -5,6 +5,7 @@ from app.db.base_class import Base
 from app.models.user import User
 from app.models.image import Image
 from app.models.video_task import VideoTask
+from app.models.story_bundle import StoryBundle
 
 
 # Instead, use this to make sure all models are registered:
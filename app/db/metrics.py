@@ -0,0 +1,66 @@
+import time
+import threading
+from typing import Dict
+from sqlalchemy import event
+from app.core.logging import logger
+
+
+class QueryMetrics:
+    """
+    Per-statement timing collected from engine events, used instead of SQL echo.
+
+    Only statements slower than slow_query_threshold are logged. Each process
+    keeps its own numbers: the API serves them at GET /v1/metrics/db and
+    workers log them when they stop.
+    """
+
+    def __init__(self, slow_query_threshold: float = 0.5):
+        self.slow_query_threshold = slow_query_threshold
+        self.count = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.slow_count = 0
+        self.error_count = 0
+        self._lock = threading.Lock()
+
+    def attach(self, sync_engine) -> None:
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_start_time"].pop()
+        with self._lock:
+            self.count += 1
+            self.total_time += elapsed
+            self.max_time = max(self.max_time, elapsed)
+            slow = elapsed >= self.slow_query_threshold
+            if slow:
+                self.slow_count += 1
+        if slow:
+            logger.warning(f"Slow query ({elapsed * 1000:.1f} ms): {statement[:500]}")
+
+    def _handle_error(self, exception_context):
+        # A failed statement never reaches after_cursor_execute; drop its start time here
+        conn = exception_context.connection
+        if conn is None or exception_context.cursor is None:
+            return
+        start_times = conn.info.get("query_start_time")
+        if start_times:
+            start_times.pop()
+        with self._lock:
+            self.error_count += 1
+
+    def snapshot(self) -> Dict[str, float]:
+        with self._lock:
+            return {
+                "count": self.count,
+                "total_time": self.total_time,
+                "avg_time": self.total_time / self.count if self.count else 0.0,
+                "max_time": self.max_time,
+                "slow_count": self.slow_count,
+                "error_count": self.error_count,
+            }
@@ -1,14 +1,31 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
+from app.db.metrics import QueryMetrics
+
+database_config = settings.database or {}
 
 # Create async engine
 engine = create_async_engine(
     settings.DATABASE_URL.replace('postgresql://', 'postgresql+asyncpg://'),
-    echo=True,
-    future=True
+    echo=database_config.get('echo', False),
+    future=True,
+    pool_size=database_config.get('pool_size', 10),
+    max_overflow=database_config.get('max_overflow', 20),
+    pool_timeout=database_config.get('pool_timeout', 30),
+    pool_recycle=database_config.get('pool_recycle', 1800),
+    pool_pre_ping=database_config.get('pool_pre_ping', True),
+    connect_args={
+        # Size of asyncpg's per-connection prepared statement cache
+        "prepared_statement_cache_size": database_config.get('statement_cache_size', 500),
+        "command_timeout": database_config.get('command_timeout', 60),
+    },
 )
 
+# Time every statement instead of echoing it
+query_metrics = QueryMetrics(slow_query_threshold=database_config.get('slow_query_threshold', 0.5))
+query_metrics.attach(engine.sync_engine)
+
 # Create async session factory
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
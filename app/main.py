@@ -1,8 +1,9 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import video, image, auth
+from app.api.endpoints import video, image, auth, metrics
 from app.core.config import settings
 from app.core.logging import setup_logging
+from app.services.progress_events import progress_broker
 
 app = FastAPI(title=settings.PROJECT_NAME)
 
@@ -17,4 +18,14 @@ app.add_middleware(
 
 app.include_router(auth.router, prefix="/v1/auth", tags=["auth"])
 app.include_router(video.router, prefix="/v1", tags=["video"])
-app.include_router(image.router, prefix="/v1", tags=["image"])
\ No newline at end of file
+app.include_router(image.router, prefix="/v1", tags=["image"])
+app.include_router(metrics.router, prefix="/v1", tags=["metrics"])
+
+@app.on_event("startup")
+async def start_progress_events():
+    await progress_broker.start()
+
+
+@app.on_event("shutdown")
+async def stop_progress_events():
+    await progress_broker.stop()
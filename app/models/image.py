@@ -1,11 +1,11 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum
+from sqlalchemy import Column, String, Integer, DateTime, ForeignKey, Text, Enum, insert
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
 from sqlalchemy.exc import SQLAlchemyError
-from typing import Optional, List
+from typing import Optional, List, Dict, Any
 from app.db.base_class import Base
 from app.db.session import async_session
 from app.core.logging import logger
@@ -15,6 +15,7 @@ class Image(Base):
 
     id = Column(String, primary_key=True, index=True)
     task_id = Column(String, ForeignKey("video_tasks.id"), nullable=False, index=True)
+    scene_number = Column(Integer, nullable=True)
     urls = Column(JSONB, default=list)
     subtitles = Column(Text)
     enhanced_prompt = Column(Text)
@@ -38,6 +39,22 @@ class Image(Base):
             logger.error(f"Error creating image in database: {e}")
             return None
 
+    @classmethod
+    async def bulk_create(cls, rows: List[Dict[str, Any]]) -> bool:
+        """
+        Insert all rows with one multi-row INSERT in a single transaction.
+        """
+        if not rows:
+            return True
+        try:
+            async with async_session() as session:
+                async with session.begin():
+                    await session.execute(insert(cls).values(rows))
+            return True
+        except SQLAlchemyError as e:
+            logger.error(f"Error bulk creating images in database: {e}")
+            return False
+
     @classmethod
     async def get(cls, image_id: str) -> Optional['Image']:
         async with async_session() as session:
@@ -67,7 +84,7 @@ class Image(Base):
     @classmethod
     async def list_by_task(cls, task_id: str, limit: int = 100, offset: int = 0) -> List['Image']:
         async with async_session() as session:
-            query = select(cls).filter(cls.task_id == task_id).limit(limit).offset(offset)
+            query = select(cls).filter(cls.task_id == task_id).order_by(cls.scene_number, cls.created_at).limit(limit).offset(offset)
             result = await session.execute(query)
             return result.scalars().all()
 
@@ -0,0 +1,103 @@
+from contextlib import asynccontextmanager
+from sqlalchemy import Column, String, Text, DateTime, Index, select, delete, text, func as sql_func
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy.sql import func
+from sqlalchemy.exc import SQLAlchemyError
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Dict, Optional, Tuple
+from app.db.base_class import Base
+from app.db.session import async_session, engine
+from app.core.logging import logger
+
+# Advisory lock key held by the one worker currently refilling the pool
+REFILL_LOCK_KEY = 0x53544f5259504f4c  # "STORYPOL"
+
+
+class StoryBundle(Base):
+    """
+    A pre-generated story, its characters and storyboard, waiting in the warm
+    pool for a task with the same story type, language and duration.
+    """
+    __tablename__ = "story_bundles"
+
+    id = Column(String, primary_key=True, index=True)
+    story_type = Column(String, nullable=False)
+    language = Column(String, nullable=False)
+    duration = Column(String, nullable=False)
+    title = Column(Text, nullable=False)
+    description = Column(Text)
+    story = Column(Text, nullable=False)
+    characters = Column(JSONB, nullable=False)
+    storyboard = Column(JSONB, nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        Index("ix_story_bundles_combination", "story_type", "language", "duration", "created_at"),
+    )
+
+    @classmethod
+    async def create(cls, **kwargs) -> Optional['StoryBundle']:
+        try:
+            async with async_session() as session:
+                bundle = cls(**kwargs)
+                session.add(bundle)
+                await session.commit()
+                await session.refresh(bundle)
+            return bundle
+        except SQLAlchemyError as e:
+            logger.error(f"Error creating StoryBundle: {e}")
+            return None
+
+    @classmethod
+    async def claim(cls, story_type: str, language: str, duration: str, max_age: timedelta) -> Optional['StoryBundle']:
+        """
+        Atomically take the oldest matching bundle younger than max_age out of the pool.
+
+        The row is locked with SKIP LOCKED and deleted in the same statement, so
+        concurrent claims never get the same bundle and never wait on each other.
+        """
+        cutoff = datetime.now(timezone.utc) - max_age
+        oldest = (
+            select(cls.id)
+            .where(cls.story_type == story_type, cls.language == language, cls.duration == duration, cls.created_at >= cutoff)
+            .order_by(cls.created_at)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+            .scalar_subquery()
+        )
+        async with async_session() as session:
+            result = await session.execute(delete(cls).where(cls.id == oldest).returning(cls))
+            bundle = result.scalars().first()
+            await session.commit()
+        return bundle
+
+    @classmethod
+    async def counts(cls) -> Dict[Tuple[str, str, str], int]:
+        async with async_session() as session:
+            result = await session.execute(
+                select(cls.story_type, cls.language, cls.duration, sql_func.count())
+                .group_by(cls.story_type, cls.language, cls.duration)
+            )
+            return {(story_type, language, duration): count for story_type, language, duration, count in result.all()}
+
+    @classmethod
+    async def delete_older_than(cls, cutoff: datetime) -> int:
+        async with async_session() as session:
+            result = await session.execute(delete(cls).where(cls.created_at < cutoff))
+            await session.commit()
+            return result.rowcount
+
+    @classmethod
+    @asynccontextmanager
+    async def refill_lock(cls) -> AsyncIterator[bool]:
+        """
+        Try to take the pool-wide refill lock (a Postgres session advisory lock)
+        for the duration of the block; yields whether this process got it.
+        """
+        async with engine.connect() as conn:
+            acquired = (await conn.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": REFILL_LOCK_KEY})).scalar()
+            try:
+                yield bool(acquired)
+            finally:
+                if acquired:
+                    await conn.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": REFILL_LOCK_KEY})
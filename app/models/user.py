@@ -1,7 +1,8 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, select
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, select, update as sql_update
 from sqlalchemy.sql import func
 from app.db.base_class import Base
 from app.core.security import get_password_hash, verify_password
+from app.core.user_cache import user_cache
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session import async_session
 from pydantic import BaseModel
@@ -26,7 +27,23 @@ class User(Base):
             session.add(user)
             await session.commit()
             await session.refresh(user)
-            return user
+        # Drop a cached "unknown user" entry for this username
+        user_cache.invalidate(user.username)
+        return user
+
+    @classmethod
+    async def update(cls, username: str, **kwargs) -> bool:
+        async with async_session() as session:
+            result = await session.execute(
+                sql_update(cls).where(cls.username == username).values(**kwargs)
+            )
+            await session.commit()
+        user_cache.invalidate(username)
+        return result.rowcount > 0
+
+    @classmethod
+    async def deactivate(cls, username: str) -> bool:
+        return await cls.update(username, is_active=False)
 
     @classmethod
     async def get_by_username(cls, username: str) -> Optional['User']:
@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, Float, DateTime, Text, select, Enum
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, Float, Integer, DateTime, Text, select, Enum, or_, update as sql_update
+from sqlalchemy.orm import relationship, joinedload
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.sql import func
+from datetime import datetime, timedelta, timezone
 from app.db.session import async_session
-from typing import Optional, List
+from typing import Optional, List, Union
 from sqlalchemy.exc import SQLAlchemyError
 from app.db.base_class import Base  # Import Base from base_class, not from base
 from app.core.logging import logger
@@ -23,13 +25,17 @@ class VideoTask(Base):
     story_title = Column(Text)
     story_description = Column(Text)
     story_text = Column(Text)
-    status = Column(Enum('queued', 'processing', 'completed', 'failed', name='status'), nullable=False)
+    status = Column(Enum('queued', 'processing', 'completed', 'failed', name='status'), nullable=False, index=True)
     error_message = Column(Text)
     progress = Column(Float, default=0.0)
+    worker_id = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    attempts = Column(Integer, default=0, nullable=False)
+    checkpoint = Column(JSONB(none_as_null=True), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
 
-    images = relationship("Image", back_populates="task")
+    images = relationship("Image", back_populates="task", order_by="[Image.scene_number, Image.created_at]")
 
     @classmethod
     async def create(cls, **kwargs) -> Optional['VideoTask']:
@@ -51,18 +57,83 @@ class VideoTask(Base):
             return await session.get(cls, task_id)
 
     @classmethod
-    async def update(cls, task_id: str, **kwargs) -> Optional['VideoTask']:
+    async def get_with_images(cls, task_id: str) -> Optional['VideoTask']:
+        """
+        Load a task and its images, ordered by scene, in a single joined query.
+        """
         async with async_session() as session:
-            task = await session.get(cls, task_id)
-            if task:
-                for key, value in kwargs.items():
-                    setattr(task, key, value)
-                await session.commit()
-                await session.refresh(task)
-                logger.info(f"VideoTask with task_id {task_id} updated successfully")
+            query = select(cls).options(joinedload(cls.images)).where(cls.id == task_id)
+            result = await session.execute(query)
+            return result.unique().scalars().first()
+
+    @classmethod
+    async def update(cls, task_id: str, refresh: bool = True, **kwargs) -> Union['VideoTask', bool, None]:
+        """
+        Update a task with a single UPDATE statement.
+
+        With refresh=True the updated row is returned (via RETURNING); otherwise
+        only whether a row was updated.
+        """
+        async with async_session() as session:
+            statement = sql_update(cls).where(cls.id == task_id).values(**kwargs)
+            if refresh:
+                result = await session.execute(statement.returning(cls))
+                task = result.scalars().first()
+                found = task is not None
             else:
-                logger.error(f"VideoTask with task_id {task_id} not found")
-            return task
+                result = await session.execute(statement)
+                task = found = result.rowcount > 0
+            await session.commit()
+
+        if found:
+            logger.info(f"VideoTask with task_id {task_id} updated successfully")
+        else:
+            logger.error(f"VideoTask with task_id {task_id} not found")
+        return task if found else None
+
+    @classmethod
+    async def update_progress(cls, task_id: str, progress: Optional[float] = None, **kwargs) -> bool:
+        """
+        Write buffered progress (and any other buffered fields), but only while
+        the task is processing and never lowering progress, so a late flush
+        can't overwrite a final status update.
+        """
+        if progress is not None:
+            kwargs["progress"] = func.greatest(func.coalesce(cls.progress, 0), progress)
+        async with async_session() as session:
+            result = await session.execute(
+                sql_update(cls)
+                .where(cls.id == task_id, cls.status == "processing")
+                .values(**kwargs)
+            )
+            await session.commit()
+        return result.rowcount > 0
+
+    @classmethod
+    async def requeue_failed(cls, task_id: str, lease_timeout: int) -> Optional['VideoTask']:
+        """
+        Put a failed task back in the queue, keeping its checkpoint so it resumes
+        from the last completed stage. Returns None unless the task was failed
+        and no worker still holds its lease (released, or no heartbeat for
+        lease_timeout seconds), so a task is never run by two workers at once.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=lease_timeout)
+        async with async_session() as session:
+            result = await session.execute(
+                sql_update(cls)
+                .where(
+                    cls.id == task_id,
+                    cls.status == "failed",
+                    or_(cls.worker_id.is_(None), cls.heartbeat_at.is_(None), cls.heartbeat_at < cutoff),
+                )
+                .values(status="queued", error_message=None, worker_id=None, heartbeat_at=None, attempts=0)
+                .returning(cls)
+            )
+            task = result.scalars().first()
+            await session.commit()
+        if task:
+            logger.info(f"VideoTask with task_id {task_id} requeued for resume")
+        return task
 
     @classmethod
     async def delete(cls, task_id: str) -> bool:
@@ -0,0 +1,76 @@
+import tiktoken
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional
+from app.core.config import settings
+from app.core.logging import logger
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model: Optional[str] = None) -> tiktoken.Encoding:
+    try:
+        return tiktoken.encoding_for_model(model) if model else tiktoken.get_encoding("o200k_base")
+    except KeyError:
+        return tiktoken.get_encoding("o200k_base")
+
+
+def count_tokens(text: str, model: Optional[str] = None) -> int:
+    return len(get_encoding(model).encode(text))
+
+
+class PromptTemplate:
+    """
+    A chat prompt split into a static part and a variable suffix.
+
+    The system message and the start of the user message never change between
+    calls, so providers that cache prompt prefixes (OpenAI caches identical
+    prefixes of 1024+ tokens) can reuse them; only the suffix, rendered from
+    `suffix` with str.format, differs per request.
+    """
+
+    def __init__(self, name: str, system: str, prefix: str, suffix: str):
+        self.name = name
+        self.system = system
+        self.prefix = prefix
+        self.suffix = suffix
+        model = (settings.openai or {}).get('model')
+        self.static_tokens = count_tokens(system, model) + count_tokens(prefix, model)
+
+    def render(self, **variables) -> List[Dict[str, str]]:
+        suffix = self.suffix.format(**variables)
+        logger.info(
+            f"Prompt {self.name}: {self.static_tokens + count_tokens(suffix, (settings.openai or {}).get('model'))} tokens "
+            f"({self.static_tokens} cacheable prefix)"
+        )
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": f"{self.prefix}\n\n{suffix}"},
+        ]
+
+
+class PromptRegistry:
+    """
+    Named prompt templates, each compiled once on first use.
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], PromptTemplate]] = {}
+        self._templates: Dict[str, PromptTemplate] = {}
+
+    def register(self, name: str, builder: Callable[[], PromptTemplate]) -> None:
+        self._builders[name] = builder
+        self._templates.pop(name, None)
+
+    def get(self, name: str) -> PromptTemplate:
+        template = self._templates.get(name)
+        if template is None:
+            template = self._builders[name]()
+            self._templates[name] = template
+            logger.info(f"Compiled prompt template {name}: {template.static_tokens} static tokens")
+        return template
+
+    def compile_all(self) -> None:
+        for name in self._builders:
+            self.get(name)
+
+
+prompt_registry = PromptRegistry()
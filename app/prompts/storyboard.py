@@ -0,0 +1,255 @@
+"""
+Storyboard prompts, one per story type family.
+
+Everything that does not depend on the story (rules, camera vocabulary,
+output format) is in the static prefix; the title, character names and story
+text come last. project_info is filled in locally after parsing, so it is
+not part of the requested output.
+"""
+from app.core.config import settings
+from app.prompts.registry import PromptTemplate, prompt_registry
+
+SUBTITLE_RULES = """- Subtitles MUST contain only exact text from the {source}, without any additions, omissions, or modifications.
+- Include every sentence from the {source} in the subtitles, maintaining the correct order across all scenes.
+- Each subtitle must be unique; do not repeat content in multiple scenes.
+- For partial sentences at scene boundaries, include the fragment and continue it in the next scene's subtitles.
+- EVERY SCENE MUST HAVE NON-EMPTY SUBTITLES. If you run out of story text, do not create additional scenes."""
+
+POSSESSIVE_RULE = """- When using a character's name in possessive form (e.g., "Character's") in the description,
+  surround it with double curly braces {{ }} if it's not referring to the character's appearance.
+  For example: "{{Giovanni's}} workshop" or "The mysterious figure stood at the entrance of {{Giovanni's}} laboratory."
+"""
+
+CAMERA_OPTIONS = """Use only the following options for camera, lighting, and transition details:
+- Camera angles: low angle, high angle, Dutch angle, bird's eye view, worm's eye view, eye level, canted angle
+- Composition types: single shot, two-shot, over-the-shoulder, insert shot, establishing shot
+- Shot sizes: extreme close-up, close-up, medium shot, full body shot, long shot, wide shot, extreme long shot
+- Lighting types: three-point lighting, high-key lighting, low-key lighting, natural lighting, practical lighting, motivated lighting, rim lighting, soft lighting, hard lighting, silhouette lighting
+- Transition types: zoom-in, zoom-out"""
+
+FUN_FACTS_CAMERA_OPTIONS = """Use only the following options for camera, lighting, and transition details:
+- Camera: medium shot, full body shot, or wide shot
+- Lighting: natural lighting, soft lighting, or three-point lighting
+- Transition: zoom-in and zoom-out"""
+
+TRANSITION_RULES = """Guidelines for using zoom-in, and zoom-out transitions:
+- Zoom-in: Use to focus on important details, build tension, or show a character's point of view. Examples: revealing a clue, emphasizing a character's reaction, or creating suspense.
+- Zoom-out: Use to reveal context, end a scene, or show isolation. Examples: showing a character in a larger environment, concluding a sequence, or transitioning from a detail to a wider view.
+
+Important rules:
+1. Do not use zoom-in transitions when the current scene's shot size is close-up or extreme close-up.
+2. Logical consistency: Ensure camera, lighting, and composition choices match the scene content. For example:
+    - Don't use two-shot for scenes with only one character.
+    - Don't describe three-point lighting for a single character scene.
+    - Avoid using over-the-shoulder shots when there's no dialogue.
+    - Don't use natural lighting for indoor scenes without windows.
+    - Ensure the camera description matches the physical space of the scene.
+3. For transitions, use ONLY the following types:
+    - zoom-in
+    - zoom-out
+4. DO NOT use any other transition types, including {forbidden}, dissolve, or cut."""
+
+OUTPUT_FORMAT = """Output the result as a JSON object with the following structure:
+{
+    "storyboards": [
+        {
+            "scene_number": "Scene Number",
+            "description": "Scene Description",
+            "subtitles": "Subtitles or Dialogue",
+            "image": null,
+            "camera": {
+                "angle": "Camera Angle",
+                "composition_type": "Composition Type",
+                "shot_size": "Shot Size"
+            },
+            "lighting": "Lighting Type",
+            "transition_type": "Transition Type"
+        },
+        ...
+    ]
+}"""
+
+SCENE_DETAILS = """Then, for each subsequent scene, provide the following details:
+1. Scene Number
+2. Description: {description}
+3. Subtitles: Use EXACT quotes from the {source}.
+4. Camera: Specify the angle, composition type, and shot size.
+5. Lighting: Describe the lighting type used."""
+
+TRANSITION_DETAIL = "\n6. Transition: Specify the type of transition to the current scene."
+
+
+def _max_scenes() -> int:
+    return (settings.storyboard or {}).get('max_scenes', 12)
+
+
+def _opening_scene(description: str, subtitles: str) -> str:
+    return f"""First, create an opening scene:
+1. Scene Number: 1
+2. Description: {description}
+3. Subtitles: {subtitles}
+4. Camera, Lighting, and Transition: As per the guidelines below."""
+
+
+def build_general() -> PromptTemplate:
+    max_scenes = _max_scenes()
+    prefix = "\n\n".join([
+        f"Based on the story given at the end, create a detailed storyboard with up to {max_scenes} scenes.",
+        _opening_scene(
+            "A vivid description (60-70 words) that sets up an engaging question related to the overall theme of the story.",
+            "An engaging question that captures the essence of the story and piques the viewer's interest."
+        ),
+        SCENE_DETAILS.format(description="A vivid description (60-70 words) focusing on key visual elements.", source="original story") + TRANSITION_DETAIL,
+        "Guidelines:\n" + SUBTITLE_RULES.format(source="original story") + f"""
+- Adapt the storyboard to the specific story type (bedtime story, or other).
+- For bedtime stories, ensure the scenes are soothing and appropriate for children.
+- For other story types, capture the essence and genre of the story.
+- Select scenes that represent pivotal moments or significant changes in the story.
+- Ensure that the scenes flow logically and capture the essence of the story.
+- Describe characters' clothing in detail, ensuring consistency within scenes.
+- Cover the entire story without omitting any significant parts.
+- Use the provided character full names in the descriptions.
+- The total number of scenes should not exceed {max_scenes}.
+""" + POSSESSIVE_RULE,
+        CAMERA_OPTIONS,
+        TRANSITION_RULES.format(forbidden="fade"),
+        OUTPUT_FORMAT,
+    ])
+    system = '''You are a highly skilled storyboard artist with a keen eye for visual storytelling. You excel at:
+    1. Creating vivid, cinematic scene descriptions easily translatable into compelling images
+    2. Adapting to various story genres and styles while maintaining the original narrative's essence
+    3. Incorporating basic cinematographic techniques into your descriptions
+    4. Faithfully representing the original story using exact quotes for subtitles
+    5. Ensuring the visual narrative accurately captures key moments, emotions, and atmosphere
+    6. Describing characters' clothing in detail and maintaining consistency within scenes
+    7. Logically evolving characters' attire between scenes when appropriate
+    8. Specifying camera angles, composition types, and shot sizes
+    9. Describing appropriate lighting for each scene
+    10. Determining suitable transitions between scenes
+    11. Adhering to fundamental filmmaking rules and best practices
+    12. Maintaining logical consistency between scene content and technical descriptions
+
+    Your storyboards effectively bridge the gap between written narrative and visual representation,
+    paying close attention to both the overall scene composition and specific details. You ensure
+    that all technical descriptions (camera, lighting, composition) are logically consistent with
+    the scene content and character presence. Most importantly, you maintain absolute fidelity to
+    the original story text in the subtitles, using only exact quotes without any alterations.'''
+    suffix = "Story Title: {title}\nCharacter full Names: {character_names}\n\nHere's the story:\n\n{story}"
+    return PromptTemplate("storyboard.general", system, prefix, suffix)
+
+
+def build_philosophy() -> PromptTemplate:
+    max_scenes = _max_scenes()
+    prefix = "\n\n".join([
+        f"Based on the philosophical story or dialogue given at the end, create a detailed storyboard with up to {max_scenes} scenes.",
+        _opening_scene(
+            "A vivid description (60-70 words) that sets up the central philosophical question or dilemma.",
+            "An engaging question that captures the essence of the philosophical inquiry."
+        ),
+        SCENE_DETAILS.format(description="A vivid description (60-70 words) focusing on key visual elements that represent the philosophical concepts being explored.", source="original story") + TRANSITION_DETAIL,
+        "Guidelines:\n" + SUBTITLE_RULES.format(source="original story") + f"""
+- Focus on visually representing abstract philosophical concepts through concrete imagery, metaphors, or thought experiments.
+- Use visual contrasts to represent different philosophical perspectives or arguments.
+- Include scenes that show characters engaged in deep thought, dialogue, or experiencing realizations.
+- Incorporate visual elements that symbolize the philosophical themes being explored.
+- Ensure that the scenes flow logically and capture the progression of the philosophical argument or exploration.
+- The total number of scenes should not exceed {max_scenes}.
+""" + POSSESSIVE_RULE,
+        CAMERA_OPTIONS,
+        TRANSITION_RULES.format(forbidden="shake"),
+        OUTPUT_FORMAT,
+    ])
+    system = '''You are a highly skilled storyboard artist specializing in visualizing philosophical concepts. You excel at:
+    1. Creating vivid, thought-provoking scene descriptions that translate abstract ideas into concrete imagery
+    2. Developing visual metaphors and symbols to represent complex philosophical concepts
+    3. Crafting scenes that show the progression of philosophical arguments or explorations
+    4. Incorporating basic cinematographic techniques to enhance visual storytelling of philosophical ideas
+    5. Faithfully representing the original philosophical text using exact quotes for subtitles
+    6. Ensuring the visual narrative accurately captures key philosophical points and their development
+    7. Balancing abstract concepts with concrete, relatable visual elements
+    8. Maintaining logical consistency between scenes while varying visual representations of ideas
+    9. Describing characters' clothing in detail and maintaining consistency within scenes
+
+    Your storyboards effectively bridge the gap between abstract philosophical concepts and visual representation,
+    paying close attention to both the overall progression of ideas and specific details that enhance
+    the communication of complex philosophical thoughts.'''
+    suffix = "Story Title: {title}\nCharacter full Names: {character_names}\n\nHere's the philosophical story:\n\n{story}"
+    return PromptTemplate("storyboard.philosophy", system, prefix, suffix)
+
+
+def build_life_pro_tips() -> PromptTemplate:
+    max_scenes = _max_scenes()
+    prefix = "\n\n".join([
+        f"Based on the life pro tip given at the end, create a detailed storyboard with up to {max_scenes} scenes.",
+        _opening_scene(
+            "A vivid description (60-70 words) that sets up a common problem or situation related to the life pro tip.",
+            "A question that captures the essence of the problem the life pro tip addresses."
+        ),
+        SCENE_DETAILS.format(description="A vivid description (60-70 words) focusing on key visual elements that illustrate different aspects of applying the life pro tip. Include setting, characters, and visual representations of the tip being implemented or its effects.", source="original life pro tip text"),
+        "Guidelines:\n" + SUBTITLE_RULES.format(source="life pro tip text") + f"""
+- Focus on visually representing the implementation of the tip, its benefits, and potential scenarios where it can be applied.
+- Use before-and-after style scenes to show the impact of applying the tip, if applicable.
+- Include scenes that show both the process of implementing the tip and its positive outcomes.
+- Ensure that the scenes flow logically, starting with the problem, moving through the implementation of the tip, and ending with the benefits or results.
+- The total number of scenes should not exceed {max_scenes}.""",
+        CAMERA_OPTIONS,
+        TRANSITION_RULES.format(forbidden="shake"),
+        OUTPUT_FORMAT,
+    ])
+    system = '''You are a highly skilled storyboard artist specializing in visualizing practical advice and life pro tips. You excel at:
+    1. Creating vivid, relatable scene descriptions that translate life advice into compelling visuals
+    2. Developing visual narratives that show the implementation and benefits of life pro tips
+    3. Crafting before-and-after style scenes to illustrate the impact of applying advice
+    4. Incorporating basic cinematographic techniques to enhance visual storytelling of practical tips
+    5. Faithfully representing the original text using exact quotes for subtitles
+    6. Ensuring the visual narrative accurately captures key points and their practical application
+    7. Balancing informative content with visually interesting and engaging scenes
+    8. Maintaining logical consistency between scenes while providing a variety of real-life scenarios
+
+    Your storyboards effectively bridge the gap between practical advice and visual representation,
+    paying close attention to both the overall flow of information and specific details that enhance
+    the communication and application of the life pro tip.'''
+    suffix = "Life Pro Tip Title: {title}\n\nHere's the life pro tip:\n\n{story}"
+    return PromptTemplate("storyboard.life_pro_tips", system, prefix, suffix)
+
+
+def build_fun_facts() -> PromptTemplate:
+    max_scenes = _max_scenes()
+    prefix = "\n\n".join([
+        f"Based on the fun fact given at the end, create a detailed storyboard with up to {max_scenes} scenes.",
+        _opening_scene(
+            "A vivid description (60-70 words) that sets up an engaging question related to the fun fact.",
+            "An engaging question that captures the essence of the fun fact and piques the viewer's interest."
+        ),
+        SCENE_DETAILS.format(description="A vivid description (60-70 words) focusing on key visual elements that illustrate different aspects of the fun fact. Include setting, characters (if applicable), and visual representations of the information.", source="original fun fact text") + TRANSITION_DETAIL,
+        "Guidelines:\n" + SUBTITLE_RULES.format(source="fun fact text") + f"""
+- Focus on visually representing the information, statistics, or concepts mentioned in the fun fact.
+- Use visual metaphors or analogies to help explain complex ideas if necessary.
+- Include scenes that show the real-world application or implications of the fun fact, if applicable.
+- Ensure that the scenes flow logically and build upon each other to tell a coherent visual story about the fun fact.
+- The total number of scenes should not exceed {max_scenes}.""",
+        FUN_FACTS_CAMERA_OPTIONS,
+        TRANSITION_RULES.format(forbidden="shake"),
+        OUTPUT_FORMAT,
+    ])
+    system = '''You are a highly skilled storyboard artist specializing in visualizing educational content and fun facts. You excel at:
+    1. Creating vivid, engaging scene descriptions that translate informational content into compelling visuals
+    2. Developing visual metaphors and analogies to represent complex ideas or statistics
+    3. Crafting scenes that show the real-world applications or implications of the information
+    4. Incorporating basic cinematographic techniques to enhance visual storytelling of educational content
+    5. Faithfully representing the original text using exact quotes for subtitles
+    6. Ensuring the visual narrative accurately captures key points and their development
+    7. Balancing informative content with visually interesting and engaging scenes
+    8. Maintaining logical consistency between scenes while providing a variety of visual representations
+
+    Your storyboards effectively bridge the gap between factual information and visual representation,
+    paying close attention to both the overall flow of information and specific details that enhance
+    the communication of the fun fact.'''
+    suffix = "Fun Fact Title: {title}\n\nHere's the fun fact:\n\n{story}"
+    return PromptTemplate("storyboard.fun_facts", system, prefix, suffix)
+
+
+prompt_registry.register("storyboard.general", build_general)
+prompt_registry.register("storyboard.philosophy", build_philosophy)
+prompt_registry.register("storyboard.life_pro_tips", build_life_pro_tips)
+prompt_registry.register("storyboard.fun_facts", build_fun_facts)
@@ -0,0 +1,93 @@
+import re
+from pydantic import BaseModel, field_validator
+from typing import List, Optional
+
+
+class StoryDraft(BaseModel):
+    title: str
+    description: str
+    story: str
+
+    @field_validator('title', 'description', 'story')
+    def not_empty(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError("must not be empty")
+        return v
+
+
+class Character(BaseModel):
+    name: str
+    ethnicity: str = ""
+    gender: str = ""
+    age: str = ""
+    facial_features: str = ""
+    body_type: str = ""
+    hair_style: str = ""
+    accessories: str = ""
+
+    @field_validator('*', mode='before')
+    def to_text(cls, v):
+        # Models sometimes answer with numbers, lists or null for free-text attributes
+        if v is None:
+            return ""
+        if isinstance(v, list):
+            return ", ".join(str(item) for item in v)
+        return str(v) if not isinstance(v, str) else v
+
+    @field_validator('name')
+    def name_not_empty(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError("must not be empty")
+        return v
+
+
+class CharacterList(BaseModel):
+    characters: List[Character]
+
+
+class Camera(BaseModel):
+    angle: str = ""
+    composition_type: str = ""
+    shot_size: str = ""
+
+
+class Scene(BaseModel):
+    scene_number: int
+    description: str
+    subtitles: str
+    image: Optional[str] = None
+    camera: Camera = Camera()
+    lighting: str = ""
+    transition_type: Optional[str] = None
+
+    @field_validator('scene_number', mode='before')
+    def parse_scene_number(cls, v):
+        if isinstance(v, str):
+            match = re.search(r'\d+', v)
+            return int(match.group()) if match else v
+        return v
+
+    @field_validator('camera', mode='before')
+    def default_camera(cls, v):
+        return v if isinstance(v, (dict, Camera)) else {}
+
+    @field_validator('description', 'subtitles')
+    def not_empty(cls, v):
+        v = v.strip()
+        if not v:
+            raise ValueError("must not be empty")
+        return v
+
+    @field_validator('transition_type', mode='before')
+    def normalize_transition(cls, v):
+        # Only zoom-in/zoom-out are rendered; anything else means no transition
+        if not isinstance(v, str):
+            return None
+        v = v.strip().lower().replace(" ", "-").replace("_", "-")
+        return v if v in ("zoom-in", "zoom-out") else None
+
+
+class Storyboard(BaseModel):
+    storyboards: List[Scene]
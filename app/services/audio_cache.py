@@ -0,0 +1,118 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+from typing import Dict, Optional
+from app.core.config import settings
+from app.core.logging import logger
+
+
+class AudioCache:
+    """
+    Content-addressed on-disk cache for synthesized speech.
+
+    Entries are keyed by a hash of (text, voice, speed, model), written
+    atomically (temp file + rename) and evicted least-recently-used once the
+    cache grows past max_bytes. Reads bump an entry's mtime, which is what
+    eviction orders by, so the cache directory can be shared by processes.
+    All methods are blocking; call them from a thread in async code.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, max_bytes: Optional[int] = None):
+        tts_config = settings.tts or {}
+        self.cache_dir = cache_dir or tts_config.get('cache_dir') or os.path.join(settings.STORY_DIR, "tts_cache")
+        self.max_bytes = max_bytes or tts_config.get('cache_max_bytes', 1024 * 1024 * 1024)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._size: Optional[int] = None
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, voice: str, speed: float, model: str) -> str:
+        payload = json.dumps([text, voice, speed, model], ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.mp3")
+
+    def get(self, key: str, output_file: str) -> bool:
+        """
+        Copy the cached audio for key to output_file. Returns False on a miss.
+        """
+        path = self._path(key)
+        try:
+            shutil.copyfile(path, output_file)
+            os.utime(path)
+        except FileNotFoundError:
+            with self._lock:
+                self.misses += 1
+            return False
+        with self._lock:
+            self.hits += 1
+        return True
+
+    def put(self, key: str, data: bytes) -> None:
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        except Exception:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+        with self._lock:
+            if self._size is not None:
+                self._size += len(data)
+            needs_eviction = self._size is None or self._size > self.max_bytes
+        if needs_eviction:
+            self._evict()
+
+    def _evict(self) -> None:
+        entries = []
+        for root, _, files in os.walk(self.cache_dir):
+            for name in files:
+                if not name.endswith(".mp3"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        evicted = 0
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+            evicted += 1
+
+        with self._lock:
+            self._size = total
+            self.evictions += evicted
+        if evicted:
+            logger.info(f"Evicted {evicted} entries from TTS cache, {total} bytes remaining")
+
+    def stats(self) -> Dict[str, float]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "size_bytes": self._size or 0,
+            }
@@ -3,24 +3,38 @@ import asyncio
 from openai import AsyncAzureOpenAI, AsyncOpenAI
 from app.core.config import settings
 from app.core.logging import logger
+from app.services.audio_cache import AudioCache
+from app.services.rate_limiter import get_limiter
 
 class AudioGenerator:
     def __init__(self, client: AsyncAzureOpenAI | AsyncOpenAI):
         self.client = client
         self.speech_rate = settings.tts.get('speech_rate', 1.0)  # Default to 1.0 if not found
+        self.model = settings.tts.get('model', 'tts-1')
+        self.cache = AudioCache() if settings.tts.get('cache_enabled', True) else None
 
     async def generate_audio(self, text: str, output_file: str, voice_name: str) -> bool:
         try:
-            result = await self.client.audio.speech.create(
-                model="tts-1",
+            cache_key = AudioCache.make_key(text, voice_name, self.speech_rate, self.model)
+            if self.cache and await asyncio.to_thread(self.cache.get, cache_key, output_file):
+                logger.info(f"Speech for text [{text}] served from cache to [{output_file}]")
+                return True
+
+            result = await get_limiter("openai", self.model).call(
+                self.client.audio.speech.create,
+                model=self.model,
                 voice=voice_name,
                 input=text,
                 speed=self.speech_rate,
                 response_format="mp3"
             )
             # Save the audio content to the output file
-            with open(output_file, "wb") as audio_file:
-                audio_file.write(result.content)
+            await asyncio.to_thread(self._write_file, output_file, result.content)
+            if self.cache:
+                try:
+                    await asyncio.to_thread(self.cache.put, cache_key, result.content)
+                except OSError as e:
+                    logger.warning(f"Failed to cache synthesized speech: {str(e)}")
 
             logger.info(f"Speech synthesized for text [{text}], and the audio was saved to [{output_file}]")
             return True
@@ -29,4 +43,7 @@ class AudioGenerator:
             logger.error(f"Error generating audio: {str(e)}")
             return False
 
-   
+    @staticmethod
+    def _write_file(output_file: str, content: bytes):
+        with open(output_file, "wb") as audio_file:
+            audio_file.write(content)
@@ -6,9 +6,8 @@ from app.core.config import settings
 from app.core.logging import logger
 from app.utils.helpers import create_blank_image
 from app.models.image import Image
+from app.services.progress_events import progress_broker
 # from app.models.image_task import ImageTask
-import asyncio
-import time
 
 class ImageGenerator:
     def __init__(self, image_generator_func: Callable[[str], Optional[str]] = None):
@@ -67,52 +66,30 @@ class ImageGenerator:
 
         return image_url, enhanced_prompt
 
-    async def generate_images(self, task_id: str, storyboard_project: Dict[str, Any], art_style: str) -> List[str]:
-        start_time = time.time()
-        tasks = []
-
-        characters = storyboard_project.get('characters', [])
-        for i, storyboard in enumerate(storyboard_project['storyboards']):
-            task = self.prepare_and_generate_image(task_id, storyboard, characters, art_style)
-            tasks.append(task)
-
-        results = await asyncio.gather(*tasks, return_exceptions=True)
-
-        image_urls = []
-        for i, result in enumerate(results):
-            if isinstance(result, tuple) and len(result) == 2:
-                image_url, enhanced_prompt = result
-                if image_url is not None:
-                    storyboard_project['storyboards'][i]['image'] = image_url
-                    storyboard_project['storyboards'][i]['enhanced_prompt'] = enhanced_prompt
-                    storyboard_project['storyboards'][i]['error_message'] = None
-                    image_urls.append(image_url)
-                    logger.info(f"Image {i+1} generated successfully for task {task_id}: {image_url}")
-                else:
-                    error_message = "Image generation failed: image_url is None"
-                    logger.error(f"Error generating image {i+1} for task {task_id}: {error_message}")
-                    storyboard_project['storyboards'][i]['image'] = None
-                    storyboard_project['storyboards'][i]['enhanced_prompt'] = enhanced_prompt
-                    storyboard_project['storyboards'][i]['error_message'] = error_message
-                    image_urls.append(None)
-            else:
-                if isinstance(result, Exception):
-                    error_message = str(result)
-                else:
-                    error_message = f"Unexpected result: {result}"
-                
-                logger.error(f"Error generating image {i+1} for task {task_id}: {error_message}")
-                storyboard_project['storyboards'][i]['image'] = None
-                storyboard_project['storyboards'][i]['enhanced_prompt'] = None
-                storyboard_project['storyboards'][i]['error_message'] = error_message
-                image_urls.append(None)
-
-        end_time = time.time()
-        total_time = end_time - start_time
-        logger.info(f"generate_images completed for task {task_id} in {total_time:.2f} seconds")
-        logger.info(f"Total images generated for task {task_id}: {len(image_urls)}")
+    async def generate_scene_image(self, task_id: str, index: int, total: int, storyboard: Dict[str, Any], characters: List[Dict[str, Any]], art_style: str) -> Optional[str]:
+        """
+        Generate the image for one storyboard scene, record the outcome on the
+        storyboard (image, enhanced_prompt, error_message) and publish it.
+        """
+        try:
+            image_url, enhanced_prompt = await self.prepare_and_generate_image(task_id, storyboard, characters, art_style)
+            error_message = None if image_url is not None else "Image generation failed: image_url is None"
+        except Exception as e:
+            image_url, enhanced_prompt, error_message = None, None, str(e)
+
+        storyboard['image'] = image_url
+        storyboard['enhanced_prompt'] = enhanced_prompt
+        storyboard['error_message'] = error_message
+        if image_url is not None:
+            logger.info(f"Image {index+1} generated successfully for task {task_id}: {image_url}")
+        else:
+            logger.error(f"Error generating image {index+1} for task {task_id}: {error_message}")
 
-        return image_urls
+        await progress_broker.publish(
+            task_id, "image", scene=index + 1, total=total,
+            status="completed" if image_url else "failed", url=image_url, error=error_message
+        )
+        return image_url
 
     async def regenerate_image(self, task_id: str, image_id: str) -> Optional[str]:
         image = await Image.get(image_id)
@@ -120,7 +97,10 @@ class ImageGenerator:
             logger.error(f"Image not found: {image_id}")
             return None
 
-        image_url = await self.image_generator_func(task_id, image.enhanced_prompt)
+        try:
+            image_url = await self.image_generator_func(task_id, image.enhanced_prompt)
+        except Exception:
+            image_url = None
 
         current_time = datetime.now()
 
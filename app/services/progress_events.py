@@ -0,0 +1,129 @@
+import json
+import asyncio
+import asyncpg
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, Optional, Set
+from sqlalchemy import text
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.session import engine
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_PAYLOAD_BYTES = 7900
+# Free text such as error messages is cut to this many characters
+MAX_TEXT_LENGTH = 500
+# What is left of an event whose payload is still too large
+ESSENTIAL_FIELDS = ("task_id", "type", "status", "step", "progress", "completed_steps", "total_steps", "scene", "total", "percent")
+
+
+def encode_event(event: Dict[str, Any]) -> str:
+    """
+    Serialize an event for NOTIFY, truncating free text so the payload always
+    fits; losing a terminal event would leave SSE clients waiting forever.
+    """
+    event = {
+        key: value[:MAX_TEXT_LENGTH] + "..." if isinstance(value, str) and len(value) > MAX_TEXT_LENGTH else value
+        for key, value in event.items()
+    }
+    payload = json.dumps(event, default=str)
+    if len(payload.encode()) > MAX_PAYLOAD_BYTES:
+        event = {key: value for key, value in event.items() if key in ESSENTIAL_FIELDS}
+        event["truncated"] = True
+        payload = json.dumps(event, default=str)
+    return payload
+
+
+class ProgressBroker:
+    """
+    Pub/sub for task progress events.
+
+    Workers and the API run in different processes, so by default events are
+    published with Postgres NOTIFY and every API process LISTENs on the channel
+    and fans them out to its local subscribers. With use_pg_notify disabled,
+    events are only delivered within the publishing process, which only
+    reaches SSE clients when the API and the task processing share a process.
+    """
+
+    def __init__(self):
+        events_config = settings.progress_events or {}
+        self.channel = events_config.get('channel', 'video_task_events')
+        self.use_pg_notify = events_config.get('use_pg_notify', True)
+        self.queue_size = events_config.get('queue_size', 100)
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._listener_task: Optional[asyncio.Task] = None
+
+    def _deliver(self, event: Dict[str, Any]):
+        for queue in list(self._subscribers.get(event.get("task_id"), ())):
+            try:
+                queue.put_nowait(event)
+            except asyncio.QueueFull:
+                # A slow client only misses intermediate events; it still gets later ones
+                pass
+
+    async def publish(self, task_id: str, event_type: str, **data) -> None:
+        event = {"task_id": task_id, "type": event_type, **data}
+        if not self.use_pg_notify:
+            self._deliver(event)
+            return
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(
+                    text("SELECT pg_notify(:channel, :payload)"),
+                    {"channel": self.channel, "payload": encode_event(event)}
+                )
+        except Exception as e:
+            logger.error(f"Error publishing progress event for task {task_id}: {str(e)}")
+
+    @asynccontextmanager
+    async def subscribe(self, task_id: str) -> AsyncIterator[asyncio.Queue]:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[task_id].add(queue)
+        try:
+            yield queue
+        finally:
+            self._subscribers[task_id].discard(queue)
+            if not self._subscribers[task_id]:
+                del self._subscribers[task_id]
+
+    def _on_notify(self, connection, pid, channel, payload):
+        try:
+            self._deliver(json.loads(payload))
+        except json.JSONDecodeError:
+            logger.error(f"Invalid progress event payload: {payload}")
+
+    async def _listen_forever(self):
+        while True:
+            terminated = asyncio.Event()
+            try:
+                connection = await asyncpg.connect(settings.DATABASE_URL)
+                connection.add_termination_listener(lambda _: terminated.set())
+                await connection.add_listener(self.channel, self._on_notify)
+                logger.info(f"Listening for progress events on channel {self.channel}")
+                try:
+                    await terminated.wait()
+                finally:
+                    if not connection.is_closed():
+                        await connection.close()
+                logger.warning("Progress event listener connection closed, reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Progress event listener error: {str(e)}")
+            await asyncio.sleep(5)
+
+    async def start(self):
+        if self.use_pg_notify and self._listener_task is None:
+            self._listener_task = asyncio.create_task(self._listen_forever())
+
+    async def stop(self):
+        if self._listener_task is not None:
+            self._listener_task.cancel()
+            try:
+                await self._listener_task
+            except asyncio.CancelledError:
+                pass
+            self._listener_task = None
+
+
+progress_broker = ProgressBroker()
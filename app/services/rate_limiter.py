@@ -0,0 +1,211 @@
+import time
+import random
+import asyncio
+import httpx
+import openai
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+from app.core.config import settings
+from app.core.logging import logger
+
+DEFAULT_LIMITS = {
+    "rate": 10.0,                # requests per second
+    "burst": 20,                 # bucket size
+    "min_concurrency": 1,
+    "max_concurrency": 32,
+    "initial_concurrency": 8,
+    "latency_target": None,      # seconds; slower calls shrink concurrency like a 429 would (gently)
+    "max_retries": 3,
+    "backoff_base": 1.0,
+    "backoff_max": 30.0,
+}
+
+
+def backoff_delay(attempt: int, base: float = 1.0, maximum: float = 30.0) -> float:
+    """
+    Exponential backoff with full jitter, so concurrent callers don't retry in lockstep.
+    """
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+def _status_code(exc: Exception) -> Optional[int]:
+    for source in (exc, getattr(exc, 'response', None)):
+        for attr in ('status_code', 'status'):
+            value = getattr(source, attr, None)
+            if isinstance(value, int):
+                return value
+    return None
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    headers = getattr(getattr(exc, 'response', None), 'headers', None)
+    if not headers:
+        return None
+    value = headers.get('retry-after-ms')
+    if value is not None:
+        try:
+            return float(value) / 1000
+        except ValueError:
+            pass
+    value = headers.get('retry-after')
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+def is_rate_limited(exc: Exception) -> bool:
+    return isinstance(exc, openai.RateLimitError) or _status_code(exc) == 429
+
+
+def is_transient(exc: Exception) -> bool:
+    if isinstance(exc, (asyncio.TimeoutError, ConnectionError, openai.APIConnectionError, httpx.TransportError)):
+        return True
+    status = _status_code(exc)
+    return status is not None and (status >= 500 or status == 408)
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = max(1, burst)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class AdaptiveConcurrency:
+    """
+    AIMD concurrency limit: grows by roughly one slot per limit's worth of
+    successful calls, and is cut multiplicatively on throttling or slow calls.
+    """
+
+    def __init__(self, initial: int, minimum: int, maximum: int, latency_target: Optional[float] = None):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.limit = float(min(max(initial, self.minimum), self.maximum))
+        self.latency_target = latency_target
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            await self._condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, latency: Optional[float], throttled: bool = False):
+        """
+        Free a slot. latency is None for calls that were cancelled, which don't
+        say anything about the provider and leave the limit unchanged.
+        """
+        async with self._condition:
+            self.in_flight -= 1
+            if latency is None:
+                pass  # cancelled
+            elif throttled:
+                self.limit = max(self.minimum, self.limit * 0.5)
+            elif self.latency_target and latency > self.latency_target:
+                self.limit = max(self.minimum, self.limit * 0.9)
+            else:
+                self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            self._condition.notify_all()
+
+
+class ProviderLimiter:
+    """
+    Gatekeeper for calls to one external API (provider and model).
+
+    Every call takes a token from the provider's bucket and a slot from its
+    adaptive concurrency limit. Rate-limited (429) and transient failures are
+    retried with jittered exponential backoff; a Retry-After from the provider
+    pauses every caller of this limiter, not just the one that was throttled.
+    """
+
+    def __init__(self, name: str, limits: Dict[str, Any]):
+        self.name = name
+        self.bucket = TokenBucket(limits['rate'], limits['burst'])
+        self.concurrency = AdaptiveConcurrency(
+            limits['initial_concurrency'],
+            limits['min_concurrency'],
+            limits['max_concurrency'],
+            limits['latency_target'],
+        )
+        self.max_retries = limits['max_retries']
+        self.backoff_base = limits['backoff_base']
+        self.backoff_max = limits['backoff_max']
+        self.paused_until = 0.0
+        self.throttled_count = 0
+
+    async def _wait_if_paused(self):
+        delay = self.paused_until - time.monotonic()
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+    async def call(self, func: Callable[..., Awaitable[Any]], *args, **kwargs) -> Any:
+        for attempt in range(self.max_retries + 1):
+            await self._wait_if_paused()
+            await self.bucket.acquire()
+            await self.concurrency.acquire()
+            started = time.monotonic()
+            latency: Optional[float] = None
+            throttled = False
+            try:
+                result = await func(*args, **kwargs)
+                latency = time.monotonic() - started
+                return result
+            except Exception as e:
+                latency = time.monotonic() - started
+                throttled = is_rate_limited(e)
+                if not (throttled or is_transient(e)) or attempt == self.max_retries:
+                    raise
+                error = e
+            finally:
+                # Runs on cancellation too (CancelledError isn't an Exception), so
+                # slots can't leak; shielded so a second cancel can't skip it
+                await asyncio.shield(self.concurrency.release(latency, throttled=throttled))
+
+            delay = _retry_after(error) if throttled else None
+            if delay is not None:
+                self.paused_until = max(self.paused_until, time.monotonic() + delay)
+            else:
+                delay = backoff_delay(attempt, self.backoff_base, self.backoff_max)
+            if throttled:
+                self.throttled_count += 1
+            logger.warning(
+                f"{self.name} call {'rate limited' if throttled else 'failed'} "
+                f"(attempt {attempt + 1}/{self.max_retries + 1}): {str(error)}; "
+                f"retrying in {delay:.1f}s, concurrency limit now {int(self.concurrency.limit)}"
+            )
+            await asyncio.sleep(delay)
+
+
+_limiters: Dict[Tuple[str, Optional[str]], ProviderLimiter] = {}
+
+
+def get_limiter(provider: str, model: Optional[str] = None) -> ProviderLimiter:
+    """
+    Return the shared limiter for a provider/model, configured from settings.rate_limits.
+
+    Limits are read from rate_limits[provider], overridden by
+    rate_limits[provider]["models"][model] when present.
+    """
+    key = (provider, model)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        provider_config = dict((settings.rate_limits or {}).get(provider, {}))
+        model_config = provider_config.pop('models', {}).get(model, {}) if model else {}
+        provider_config.pop('models', None)
+        limits = {**DEFAULT_LIMITS, **provider_config, **model_config}
+        limiter = ProviderLimiter(f"{provider}:{model}" if model else provider, limits)
+        _limiters[key] = limiter
+    return limiter
@@ -0,0 +1,89 @@
+import os
+import asyncio
+import inspect
+import multiprocessing
+import queue
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Any, Awaitable, Callable, Optional, Union
+from app.core.config import settings
+from app.core.logging import logger
+
+ProgressCallback = Callable[[int], Union[None, Awaitable[None]]]
+
+
+class RenderExecutor:
+    """
+    Runs CPU-bound render functions in a pool of worker processes.
+
+    Renders no longer hold the GIL of the process serving the event loop, and
+    several renders can use separate cores at once. Functions submitted through
+    run() must be module-level and accept a progress_queue keyword argument;
+    integer percentages put on that queue are handed to progress_callback.
+
+    If a render process dies (e.g. OOM-killed), the pool is broken for good:
+    that render fails and the next run() starts a fresh pool.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None):
+        self.max_workers = max_workers or (settings.video or {}).get('render_workers') or os.cpu_count() or 1
+        self._context = multiprocessing.get_context("spawn")
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._manager = None
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=self._context)
+            logger.info(f"Started render pool with {self.max_workers} processes")
+        return self._pool
+
+    def _discard_pool(self, pool: ProcessPoolExecutor):
+        # Concurrent renders on the broken pool all fail; only the first one replaces it
+        if self._pool is pool:
+            self._pool = None
+            pool.shutdown(wait=False)
+            logger.warning("Render pool broke, a new one will be started for the next render")
+
+    def _get_manager(self):
+        if self._manager is None:
+            self._manager = self._context.Manager()
+        return self._manager
+
+    async def _report(self, progress_queue, progress_callback: ProgressCallback):
+        while True:
+            try:
+                percent = progress_queue.get_nowait()
+            except queue.Empty:
+                return
+            result = progress_callback(percent)
+            if inspect.isawaitable(result):
+                await result
+
+    async def run(self, func: Callable[..., Any], *args, progress_callback: Optional[ProgressCallback] = None, **kwargs) -> Any:
+        loop = asyncio.get_running_loop()
+        progress_queue = self._get_manager().Queue() if progress_callback else None
+        pool = self._get_pool()
+        try:
+            future = loop.run_in_executor(
+                pool,
+                partial(func, *args, progress_queue=progress_queue, **kwargs)
+            )
+
+            if progress_queue is not None:
+                while not future.done():
+                    await asyncio.wait({future}, timeout=0.5)
+                    await self._report(progress_queue, progress_callback)
+
+            return await future
+        except BrokenProcessPool:
+            self._discard_pool(pool)
+            raise
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        if self._manager is not None:
+            self._manager.shutdown()
+            self._manager = None
@@ -1,25 +1,163 @@
+import os
+import shutil
+import asyncio
+import mimetypes
+import threading
 import boto3
+from abc import ABC, abstractmethod
+from botocore.config import Config
+from boto3.s3.transfer import TransferConfig
 from app.core.config import settings
 from app.core.logging import logger
-from typing import Optional
+from typing import Awaitable, Callable, Optional, Set, Union
+
+# Called with (bytes_uploaded, total_bytes)
+UploadProgressCallback = Callable[[int, int], Union[None, Awaitable[None]]]
+
+
+class StorageBackend(ABC):
+    @abstractmethod
+    async def upload(self, file_path: str, object_name: str, progress_callback: Optional[UploadProgressCallback] = None) -> str:
+        """
+        Store file_path as object_name and return its public URL.
+        """
+
+
+class _ProgressForwarder:
+    """
+    boto3 reports progress from its transfer threads; this hops each report
+    back onto the event loop. Coroutine callbacks run as tasks that are kept
+    until wait() has awaited them, so none is lost or left unobserved.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, total: int, progress_callback: UploadProgressCallback):
+        self.loop = loop
+        self.total = total
+        self.progress_callback = progress_callback
+        self._lock = threading.Lock()
+        self._uploaded = 0
+        self._pending: Set[asyncio.Task] = set()
+
+    def __call__(self, bytes_amount: int):
+        with self._lock:
+            self._uploaded += bytes_amount
+            done = self._uploaded
+        self.loop.call_soon_threadsafe(self._deliver, done)
+
+    def _deliver(self, done: int):
+        result = self.progress_callback(done, self.total)
+        if asyncio.iscoroutine(result):
+            self._pending.add(self.loop.create_task(result))
+
+    async def wait(self):
+        # Let reports queued by the transfer threads be delivered first
+        await asyncio.sleep(0)
+        pending, self._pending = self._pending, set()
+        for result in await asyncio.gather(*pending, return_exceptions=True):
+            if isinstance(result, Exception):
+                logger.error(f"Upload progress callback failed: {str(result)}")
+
+
+class R2StorageBackend(StorageBackend):
+    """
+    S3-compatible backend (Cloudflare R2, or MinIO by pointing R2_ENDPOINT at it).
+
+    Large files are uploaded as multipart uploads with parts sent in parallel
+    over a pooled connection set. The transfer runs in a worker thread so the
+    event loop is never blocked.
+    """
 
-class StorageService:
     def __init__(self):
+        storage_config = settings.storage or {}
+        chunk_size = storage_config.get('multipart_chunk_size', 8 * 1024 * 1024)
+        max_concurrency = storage_config.get('max_concurrency', 8)
         self.r2_client = boto3.client(
             's3',
             endpoint_url=settings.R2_ENDPOINT,
             aws_access_key_id=settings.R2_ACCESS_KEY_ID,
-            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY
+            aws_secret_access_key=settings.R2_SECRET_ACCESS_KEY,
+            config=Config(
+                max_pool_connections=storage_config.get('max_pool_connections', max(10, max_concurrency)),
+                retries={"max_attempts": storage_config.get('max_attempts', 3), "mode": "standard"},
+            )
         )
+        self.transfer_config = TransferConfig(
+            multipart_threshold=chunk_size,
+            multipart_chunksize=chunk_size,
+            max_concurrency=max_concurrency,
+            use_threads=True,
+        )
+
+    async def upload(self, file_path: str, object_name: str, progress_callback: Optional[UploadProgressCallback] = None) -> str:
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        forwarder = None
+        if progress_callback is not None:
+            forwarder = _ProgressForwarder(asyncio.get_running_loop(), os.path.getsize(file_path), progress_callback)
+        try:
+            await asyncio.to_thread(
+                self.r2_client.upload_file,
+                file_path,
+                settings.R2_BUCKET_NAME,
+                object_name,
+                ExtraArgs={"ContentType": content_type},
+                Config=self.transfer_config,
+                Callback=forwarder,
+            )
+        finally:
+            if forwarder is not None:
+                await forwarder.wait()
+        # url = f"{settings.R2_ENDPOINT}/{settings.R2_BUCKET_NAME}/{object_name}"
+        # for public access
+        return f"{settings.R2_PUBLIC_ENDPOINT}/{object_name}"
+
+
+class LocalStorageBackend(StorageBackend):
+    """
+    Stores objects under a local directory. Useful for development and tests.
+    """
+
+    def __init__(self, root_dir: Optional[str] = None, public_url: Optional[str] = None):
+        storage_config = settings.storage or {}
+        self.root_dir = root_dir or storage_config.get('local_dir') or os.path.join(settings.STORY_DIR, "storage")
+        self.public_url = public_url or storage_config.get('local_public_url')
+
+    def _copy(self, file_path: str, destination: str):
+        os.makedirs(os.path.dirname(destination), exist_ok=True)
+        temp_path = f"{destination}.part"
+        shutil.copyfile(file_path, temp_path)
+        os.replace(temp_path, destination)
+
+    async def upload(self, file_path: str, object_name: str, progress_callback: Optional[UploadProgressCallback] = None) -> str:
+        destination = os.path.join(self.root_dir, object_name)
+        await asyncio.to_thread(self._copy, file_path, destination)
+        if progress_callback is not None:
+            size = os.path.getsize(destination)
+            result = progress_callback(size, size)
+            if asyncio.iscoroutine(result):
+                await result
+        if self.public_url:
+            return f"{self.public_url.rstrip('/')}/{object_name}"
+        return f"file://{os.path.abspath(destination)}"
+
+
+STORAGE_BACKENDS = {
+    "r2": R2StorageBackend,
+    "local": LocalStorageBackend,
+}
+
+
+class StorageService:
+    def __init__(self, backend: Optional[StorageBackend] = None):
+        if backend is None:
+            backend_name = (settings.storage or {}).get('backend', 'r2')
+            backend = STORAGE_BACKENDS[backend_name]()
+        self.backend = backend
 
-    async def upload_to_r2(self, file_path: str, object_name: str) -> Optional[str]:
+    async def upload_to_r2(self, file_path: str, object_name: str, progress_callback: Optional[UploadProgressCallback] = None) -> Optional[str]:
         try:
-            self.r2_client.upload_file(file_path, settings.R2_BUCKET_NAME, object_name)
-            # url = f"{settings.R2_ENDPOINT}/{settings.R2_BUCKET_NAME}/{object_name}"
-            # for public access
-            url = f"{settings.R2_PUBLIC_ENDPOINT}/{object_name}"
+            url = await self.backend.upload(file_path, object_name, progress_callback)
             logger.info(f"File uploaded successfully to R2: {url}")
             return url
         except Exception as e:
             logger.error(f"Error uploading file to R2: {str(e)}")
-            return None
\ No newline at end of file
+            return None
@@ -1,13 +1,68 @@
 # app/services/story_generator.py
-from datetime import datetime
 import logging
-from typing import Dict, Any, List, Tuple
-import json
-import re
-from app.utils.helpers import call_openai_api, create_empty_storyboard
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator, Awaitable, Callable
+from app.utils.helpers import call_openai_api, stream_openai_api, create_empty_storyboard
+from app.utils.json_stream import JsonArrayItemParser
+from app.prompts.registry import prompt_registry
+import app.prompts.storyboard  # registers the storyboard templates
 from app.core.config import settings
 from app.core.logging import logger
 from app.utils.helpers import get_story_limit
+from app.schemas.story import StoryDraft, CharacterList, Storyboard
+from app.services.structured_output import (
+    StructuredOutputError,
+    parse_storyboard,
+    request_structured,
+    response_format_for,
+    structured_output_mode,
+    validate_scenes,
+)
+
+STORY_JSON_INSTRUCTIONS = '''
+
+Return the result as a JSON object with the fields "title", "description" and "story" instead of the labelled format above. "story" holds only the main content.'''
+
+# Used in place of the name list when the storyboard is generated alongside character extraction
+NAMES_FROM_STORY = "use each character's full name exactly as it appears in the story"
+
+
+class StoryboardStream:
+    """
+    A storyboard being generated. Iterate over it to receive each scene as soon
+    as its JSON object is complete; once iteration ends, `project` holds the
+    whole storyboard, whose "storyboards" list contains those same scene dicts.
+    """
+
+    def __init__(self, chunks: AsyncIterator[str], title: str, fallback: Optional[Callable[[], Awaitable[Dict[str, Any]]]] = None):
+        self._chunks = chunks
+        self.title = title
+        self.fallback = fallback
+        self.scenes: List[Dict[str, Any]] = []
+        self.project: Optional[Dict[str, Any]] = None
+
+    async def __aiter__(self):
+        parser = JsonArrayItemParser("storyboards")
+        async for chunk in self._chunks:
+            for item in parser.feed(chunk):
+                # Validated and numbered exactly like the final full parse
+                for scene in validate_scenes([item]):
+                    scene["scene_number"] = len(self.scenes) + 1
+                    self.scenes.append(scene)
+                    yield scene
+
+        # A truncated or malformed response fails the full parse and leaves no storyboards
+        project = StoryGenerator._parse_storyboard_response(self.title, parser.text)
+        if project.get("storyboards") and self.scenes:
+            # Keep the streamed dicts so anything recorded on them by consumers is part of the project
+            project["storyboards"] = self.scenes
+        elif not self.scenes and self.fallback is not None:
+            # Nothing was started from the stream yet, so a plain request can replace it
+            logger.warning("Streamed storyboard could not be parsed, retrying without streaming")
+            project = await self.fallback()
+            for scene in project.get("storyboards", []):
+                self.scenes.append(scene)
+                yield scene
+        self.project = project
 
 
 class StoryGenerator:
@@ -43,25 +98,36 @@ class StoryGenerator:
             {"role": "user", "content": prompt},
         ]
 
-        response = await call_openai_api(self.client, messages)
+        if structured_output_mode():
+            messages[-1]["content"] += STORY_JSON_INSTRUCTIONS
+            draft = await request_structured(self.client, messages, StoryDraft, stage="story")
+            if draft is None:
+                return None, None, None
+            return draft.title, self._finalize_description(draft.description), draft.story
+
+        response = await call_openai_api(self.client, messages, stage="story")
         if response:
             parts = response.split("\n\n", 2)
             if len(parts) == 3:
                 title = parts[0].replace("Title: ", "").strip()
                 description = parts[1].replace("Description: ", "").strip()
                 content = parts[2].strip()
-                
-                # Ensure #facelessvideos.app is the last hashtag
-                description_parts = description.rsplit('#', 1)
-                if len(description_parts) > 1:
-                    description = f"{description_parts[0].rstrip()} #facelessvideos.app"
-                else:
-                    description += " #facelessvideos.app"
-                
-                return title, description, content
+                return title, self._finalize_description(description), content
         return None, None, None
 
+    @staticmethod
+    def _finalize_description(description: str) -> str:
+        # Ensure #facelessvideos.app is the last hashtag
+        description_parts = description.rsplit('#', 1)
+        if len(description_parts) > 1:
+            return f"{description_parts[0].rstrip()} #facelessvideos.app"
+        return description + " #facelessvideos.app"
+
     async def generate_characters(self, story: str) -> List[Dict[str, str]]:
+        if structured_output_mode():
+            output_instructions = 'Return the array as the "characters" field of a JSON object, without any additional text.'
+        else:
+            output_instructions = "Please provide only the JSON array, without any additional text."
         prompt = f"""Based on the following story, create detailed descriptions for each character, including their name, ethnicity, gender, age, facial features, body type, hair style, and accessories. Focus on permanent or long-term attributes.
 
             Story:
@@ -95,7 +161,7 @@ class StoryGenerator:
             - Focus on permanent or long-term features, not on changeable expressions or temporary states.
             - Do not include any descriptions of clothing or attire.
 
-            Please provide only the JSON array, without any additional text.
+            {output_instructions}
             """
 
         messages = [
@@ -114,34 +180,60 @@ class StoryGenerator:
             {"role": "user", "content": prompt},
         ]
 
-        response = await call_openai_api(self.client, messages)
-        if not response:
-            logger.error("API returned empty response")
-        
-        try:
-            return json.loads(response)
-        except json.JSONDecodeError:
-            # if the direct parsing fails, try to extract the JSON array part
-            array_match = re.search(r'\[.*\]', response, re.DOTALL)
-            if array_match:
-                try:
-                    return json.loads(array_match.group())
-                except json.JSONDecodeError:
-                    logger.error("Failed to parse the response as a JSON array.")
-                    return []
-            else:
-                logger.error("No JSON array found in the response.")
-                return []
-
-    async def generate_storyboard(self, story_type: str, title: str, story: str, character_names: List[str]) -> Dict[str, Any]:
+        result = await request_structured(self.client, messages, CharacterList, stage="characters")
+        if result is None:
+            logger.error("Failed to generate characters")
+            return []
+        return [character.model_dump() for character in result.characters]
+
+    async def generate_storyboard(self, story_type: str, title: str, story: str, character_names: Optional[List[str]]) -> Dict[str, Any]:
+        """
+        With character_names=None the model takes the names from the story
+        itself, so this can run while generate_characters is still in flight.
+        """
+        messages = self._storyboard_messages(story_type, title, story, character_names)
+        storyboard = await request_structured(self.client, messages, Storyboard, parse=parse_storyboard, stage="storyboard")
+        if storyboard is None:
+            return create_empty_storyboard(title)
+        storyboard_data = storyboard.model_dump()
+        storyboard_data["project_info"] = create_empty_storyboard(title)["project_info"]
+        return storyboard_data
+
+    def stream_storyboard(self, story_type: str, title: str, story: str, character_names: Optional[List[str]]) -> StoryboardStream:
+        """
+        Like generate_storyboard, but scenes can be consumed as soon as each one
+        has been generated (see StoryboardStream).
+        """
+        messages = self._storyboard_messages(story_type, title, story, character_names)
+        response_format = response_format_for(Storyboard)
+        chunks = stream_openai_api(self.client, messages, stage="storyboard", **({"response_format": response_format} if response_format else {}))
+        return StoryboardStream(
+            chunks, title,
+            fallback=lambda: self.generate_storyboard(story_type, title, story, character_names)
+        )
+
+    def _storyboard_messages(self, story_type: str, title: str, story: str, character_names: Optional[List[str]]) -> List[Dict[str, str]]:
         if story_type.lower() == "life pro tips":
-            return await self._generate_life_pro_tips_storyboard(title, story)
+            template = prompt_registry.get("storyboard.life_pro_tips")
         elif story_type.lower() == "philosophy":
-            return await self._generate_philosophy_storyboard(title, story, character_names)
+            template = prompt_registry.get("storyboard.philosophy")
         elif story_type.lower() == "fun facts":
-            return await self._generate_fun_facts_storyboard(title, story)
+            template = prompt_registry.get("storyboard.fun_facts")
         else:
-            return await self._generate_general_storyboard(title, story, character_names)
+            template = prompt_registry.get("storyboard.general")
+        names = ', '.join(character_names) if character_names is not None else NAMES_FROM_STORY
+        return template.render(title=title, character_names=names, story=story)
+
+    @staticmethod
+    def _parse_storyboard_response(title: str, response: Optional[str]) -> Dict[str, Any]:
+        try:
+            storyboard_data = parse_storyboard(response).model_dump()
+        except StructuredOutputError as e:
+            logger.error(f"Failed to parse storyboard: {e}")
+            return create_empty_storyboard(title)
+        # project_info isn't requested from the model; it only depends on the title
+        storyboard_data["project_info"] = create_empty_storyboard(title)["project_info"]
+        return storyboard_data
 
     def _get_prompt(self, story_type: str, char_limit: Tuple[int, int], language: str) -> str:
         base_prompt = f'''
@@ -323,534 +415,3 @@ class StoryGenerator:
 
             [Your generated story]
             '''
-
-    async def _generate_life_pro_tips_storyboard(self, title: str, story: str) -> Dict[str, Any]:
-        max_scenes = self.config.storyboard.get('max_scenes', 12)
-        timestamp = datetime.now().strftime("%Y-%m-%d %I:%M:%S %p")
-        
-        prompt = f"""Based on the following life pro tip, create a detailed storyboard with up to {max_scenes} scenes.
-
-            Life Pro Tip Title: {title}
-
-            First, create an opening scene:
-            1. Scene Number: 1
-            2. Description: A vivid description (60-70 words) that sets up a common problem or situation related to the life pro tip. 
-            3. Subtitles: A question that captures the essence of the problem the life pro tip addresses.
-            4. Camera, Lighting, and Transition: As per the guidelines below.
-
-            Then, for each subsequent scene, provide the following details:
-            1. Scene Number
-            2. Description: A vivid description (60-70 words) focusing on key visual elements that illustrate different aspects of applying the life pro tip. Include setting, characters, and visual representations of the tip being implemented or its effects.
-            3. Subtitles: Use EXACT quotes from the original life pro tip text. 
-            4. Camera: Specify the angle, composition type, and shot size.
-            5. Lighting: Describe the lighting type used.
-
-            Guidelines:
-            - Subtitles MUST contain only exact text from the life pro tip text, without any additions, omissions, or modifications.
-            - Include every sentence from the life pro tip text in the subtitles, maintaining the correct order across all scenes.
-            - Each subtitle must be unique; do not repeat content in multiple scenes.
-            - For partial sentences at scene boundaries, include the fragment and continue it in the next scene's subtitles.
-            - EVERY SCENE MUST HAVE NON-EMPTY SUBTITLES. If you run out of story text, do not create additional scenes.
-            - Focus on visually representing the implementation of the tip, its benefits, and potential scenarios where it can be applied.
-            - Use before-and-after style scenes to show the impact of applying the tip, if applicable.
-            - Include scenes that show both the process of implementing the tip and its positive outcomes.
-            - Ensure that the scenes flow logically, starting with the problem, moving through the implementation of the tip, and ending with the benefits or results.
-            - The total number of scenes should not exceed {max_scenes}.
-
-            Use only the following options for camera, lighting, and transition details:
-            - Camera angles: low angle, high angle, Dutch angle, bird's eye view, worm's eye view, eye level, canted angle
-            - Composition types: single shot, two-shot, over-the-shoulder, insert shot, establishing shot
-            - Shot sizes: extreme close-up, close-up, medium shot, full body shot, long shot, wide shot, extreme long shot
-            - Lighting types: three-point lighting, high-key lighting, low-key lighting, natural lighting, practical lighting, motivated lighting, rim lighting, soft lighting, hard lighting, silhouette lighting
-            - Transition types: zoom-in, zoom-out
-
-            Guidelines for using zoom-in, and zoom-out transitions:
-            - Zoom-in: Use to focus on important details, build tension, or show a character's point of view. Examples: revealing a clue, emphasizing a character's reaction, or creating suspense.
-            - Zoom-out: Use to reveal context, end a scene, or show isolation. Examples: showing a character in a larger environment, concluding a sequence, or transitioning from a detail to a wider view.
-
-            Important rules:
-            1. Do not use zoom-in transitions when the current scene's shot size is close-up or extreme close-up.
-            2. Logical consistency: Ensure camera, lighting, and composition choices match the scene content. For example:
-                - Don't use two-shot for scenes with only one character.
-                - Don't describe three-point lighting for a single character scene.
-                - Avoid using over-the-shoulder shots when there's no dialogue.
-                - Don't use natural lighting for indoor scenes without windows.
-                - Ensure the camera description matches the physical space of the scene.
-            3. For transitions, use ONLY the following types:
-                - zoom-in
-                - zoom-out
-            4. DO NOT use any other transition types, including shake, dissolve, or cut.
-
-            Output the result as a JSON object with the following structure:
-            {{
-                "project_info": {{
-                    "title": "{title}",
-                    "user": "AI Generated",
-                    "timestamp": "{timestamp}"
-                }},
-                "storyboards": [
-                    {{
-                        "scene_number": "Scene Number",
-                        "description": "Scene Description",
-                        "subtitles": "Subtitles or Dialogue",
-                        "image": null,
-                        "camera": {{
-                            "angle": "Camera Angle",
-                            "composition_type": "Composition Type",
-                            "shot_size": "Shot Size"
-                        }},
-                        "lighting": "Lighting Type",
-                        "transition_type": "Transition Type"
-                    }},
-                    ...
-                ]
-            }}
-
-            Here's the life pro tip:
-
-        {story}"""
-
-        messages = [
-            {
-                "role": "system",
-                "content": '''You are a highly skilled storyboard artist specializing in visualizing practical advice and life pro tips. You excel at:
-                    1. Creating vivid, relatable scene descriptions that translate life advice into compelling visuals
-                    2. Developing visual narratives that show the implementation and benefits of life pro tips
-                    3. Crafting before-and-after style scenes to illustrate the impact of applying advice
-                    4. Incorporating basic cinematographic techniques to enhance visual storytelling of practical tips
-                    5. Faithfully representing the original text using exact quotes for subtitles
-                    6. Ensuring the visual narrative accurately captures key points and their practical application
-                    7. Balancing informative content with visually interesting and engaging scenes
-                    8. Maintaining logical consistency between scenes while providing a variety of real-life scenarios
-
-                    Your storyboards effectively bridge the gap between practical advice and visual representation, 
-                    paying close attention to both the overall flow of information and specific details that enhance 
-                    the communication and application of the life pro tip.'''
-            },
-            {"role": "user", "content": prompt},
-        ]
-
-        response = await call_openai_api(self.client, messages)
-        if not response:
-            logger.error("API returned empty response")
-            return create_empty_storyboard(title)
-        
-        # Find the JSON part of the response
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            try:
-                storyboard_data = json.loads(json_str)
-                return storyboard_data
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON Decode Error: {e}")
-                logger.error(f"Failed to parse JSON: {json_str}")
-                return create_empty_storyboard(title)
-        else:
-            logger.error("No JSON object found in the response")
-            logger.error(f"Full response: {response}")
-            return create_empty_storyboard(title)
-
-    async def _generate_philosophy_storyboard(self, title: str, story: str, character_names: List[str]) -> Dict[str, Any]:
-        max_scenes = self.config.storyboard.get('max_scenes', 12)
-        timestamp = datetime.now().strftime("%Y-%m-%d %I:%M:%S %p")
-        
-        prompt = f"""Based on the following philosophical story or dialogue, create a detailed storyboard with up to {max_scenes} scenes.
-
-            Story Title: {title}
-            Character full Names: {', '.join(character_names)}
-
-            First, create an opening scene:
-            1. Scene Number: 1
-            2. Description: A vivid description (60-70 words) that sets up the central philosophical question or dilemma. 
-            3. Subtitles: An engaging question that captures the essence of the philosophical inquiry.
-            4. Camera, Lighting, and Transition: As per the guidelines below.
-
-            Then, for each subsequent scene, provide the following details:
-            1. Scene Number
-            2. Description: A vivid description (60-70 words) focusing on key visual elements that represent the philosophical concepts being explored. 
-            3. Subtitles: Use EXACT quotes from the original story. 
-            4. Camera: Specify the angle, composition type, and shot size.
-            5. Lighting: Describe the lighting type used.
-            6. Transition: Specify the type of transition to the current scene.
-
-            Guidelines:
-            - Subtitles MUST contain only exact text from the original story, without any additions, omissions, or modifications.
-            - Include every sentence from the original story in the subtitles, maintaining the correct order across all scenes.
-            - Each subtitle must be unique; do not repeat content in multiple scenes.
-            - For partial sentences at scene boundaries, include the fragment and continue it in the next scene's subtitles.
-            - EVERY SCENE MUST HAVE NON-EMPTY SUBTITLES. If you run out of story text, do not create additional scenes.
-            - Focus on visually representing abstract philosophical concepts through concrete imagery, metaphors, or thought experiments.
-            - Use visual contrasts to represent different philosophical perspectives or arguments.
-            - Include scenes that show characters engaged in deep thought, dialogue, or experiencing realizations.
-            - Incorporate visual elements that symbolize the philosophical themes being explored.
-            - Ensure that the scenes flow logically and capture the progression of the philosophical argument or exploration.
-            - The total number of scenes should not exceed {max_scenes}.
-            - When using a character's name in possessive form (e.g., "Character's") in the description, 
-              surround it with double curly braces {{{{ }}}} if it's not referring to the character's appearance. 
-              For example: "{{{{Giovanni's}}}} workshop" or "The mysterious figure stood at the entrance of {{{{Giovanni's}}}} laboratory."
-
-            Use only the following options for camera, lighting, and transition details:
-            - Camera angles: low angle, high angle, Dutch angle, bird's eye view, worm's eye view, eye level, canted angle
-            - Composition types: single shot, two-shot, over-the-shoulder, insert shot, establishing shot
-            - Shot sizes: extreme close-up, close-up, medium shot, full body shot, long shot, wide shot, extreme long shot
-            - Lighting types: three-point lighting, high-key lighting, low-key lighting, natural lighting, practical lighting, motivated lighting, rim lighting, soft lighting, hard lighting, silhouette lighting
-            - Transition types: zoom-in, zoom-out
-
-            Guidelines for using zoom-in, and zoom-out transitions:
-            - Zoom-in: Use to focus on important details, build tension, or show a character's point of view. Examples: revealing a clue, emphasizing a character's reaction, or creating suspense.
-            - Zoom-out: Use to reveal context, end a scene, or show isolation. Examples: showing a character in a larger environment, concluding a sequence, or transitioning from a detail to a wider view.
-
-            Important rules:
-            1. Do not use zoom-in transitions when the current scene's shot size is close-up or extreme close-up.
-            2. Logical consistency: Ensure camera, lighting, and composition choices match the scene content. For example:
-                - Don't use two-shot for scenes with only one character.
-                - Don't describe three-point lighting for a single character scene.
-                - Avoid using over-the-shoulder shots when there's no dialogue.
-                - Don't use natural lighting for indoor scenes without windows.
-                - Ensure the camera description matches the physical space of the scene.
-            3. For transitions, use ONLY the following types:
-                - zoom-in
-                - zoom-out
-            4. DO NOT use any other transition types, including shake, dissolve, or cut.
-
-            Output the result as a JSON object with the following structure:
-            {{
-                "project_info": {{
-                    "title": "{title}",
-                    "user": "AI Generated",
-                    "timestamp": "{timestamp}"
-                }},
-                "storyboards": [
-                    {{
-                        "scene_number": "Scene Number",
-                        "description": "Scene Description",
-                        "subtitles": "Subtitles or Dialogue",
-                        "image": null,
-                        "camera": {{
-                            "angle": "Camera Angle",
-                            "composition_type": "Composition Type",
-                            "shot_size": "Shot Size"
-                        }},
-                        "lighting": "Lighting Type",
-                        "transition_type": "Transition Type"
-                    }},
-                    ...
-                ]
-            }}
-
-            Here's the philosophical story:
-
-        {story}"""
-
-        messages = [
-            {
-                "role": "system",
-                "content": '''You are a highly skilled storyboard artist specializing in visualizing philosophical concepts. You excel at:
-                    1. Creating vivid, thought-provoking scene descriptions that translate abstract ideas into concrete imagery
-                    2. Developing visual metaphors and symbols to represent complex philosophical concepts
-                    3. Crafting scenes that show the progression of philosophical arguments or explorations
-                    4. Incorporating basic cinematographic techniques to enhance visual storytelling of philosophical ideas
-                    5. Faithfully representing the original philosophical text using exact quotes for subtitles
-                    6. Ensuring the visual narrative accurately captures key philosophical points and their development
-                    7. Balancing abstract concepts with concrete, relatable visual elements
-                    8. Maintaining logical consistency between scenes while varying visual representations of ideas
-                    9. Describing characters' clothing in detail and maintaining consistency within scenes
-
-                    Your storyboards effectively bridge the gap between abstract philosophical concepts and visual representation, 
-                    paying close attention to both the overall progression of ideas and specific details that enhance 
-                    the communication of complex philosophical thoughts.'''
-            },
-            {"role": "user", "content": prompt},
-        ]
-
-        response = await call_openai_api(self.client, messages)
-        if not response:
-            logger.error("API returned empty response")
-            return create_empty_storyboard(title)
-
-        # Find the JSON part of the response
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            try:
-                storyboard_data = json.loads(json_str)
-                return storyboard_data
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON Decode Error: {e}")
-                logger.error(f"Failed to parse JSON: {json_str}")
-                return create_empty_storyboard(title)
-        else:
-            logger.error("No JSON object found in the response")
-            logger.error(f"Full response: {response}")
-            return create_empty_storyboard(title)
-
-    async def _generate_fun_facts_storyboard(self, title: str, story: str) -> Dict[str, Any]:
-        max_scenes = self.config.storyboard.get('max_scenes', 12)
-        timestamp = datetime.now().strftime("%Y-%m-%d %I:%M:%S %p")
-        
-        prompt = f"""Based on the following fun fact, create a detailed storyboard with up to {max_scenes} scenes.
-
-            Fun Fact Title: {title}
-
-            First, create an opening scene:
-            1. Scene Number: 1
-            2. Description: A vivid description (60-70 words) that sets up an engaging question related to the fun fact. 
-            3. Subtitles: An engaging question that captures the essence of the fun fact and piques the viewer's interest.
-            4. Camera, Lighting, and Transition: As per the guidelines below.
-
-            Then, for each subsequent scene, provide the following details:
-            1. Scene Number
-            2. Description: A vivid description (60-70 words) focusing on key visual elements that illustrate different aspects of the fun fact. Include setting, characters (if applicable), and visual representations of the information.
-            3. Subtitles: Use EXACT quotes from the original fun fact text. 
-            4. Camera: Specify the angle, composition type, and shot size.
-            5. Lighting: Describe the lighting type used.
-            6. Transition: Specify the type of transition to the current scene.
-
-            Guidelines:
-            - Subtitles MUST contain only exact text from the fun fact text, without any additions, omissions, or modifications.
-            - Include every sentence from the fun fact text in the subtitles, maintaining the correct order across all scenes.
-            - Each subtitle must be unique; do not repeat content in multiple scenes.
-            - For partial sentences at scene boundaries, include the fragment and continue it in the next scene's subtitles.
-            - EVERY SCENE MUST HAVE NON-EMPTY SUBTITLES. If you run out of story text, do not create additional scenes.
-            - Focus on visually representing the information, statistics, or concepts mentioned in the fun fact.
-            - Use visual metaphors or analogies to help explain complex ideas if necessary.
-            - Include scenes that show the real-world application or implications of the fun fact, if applicable.
-            - Ensure that the scenes flow logically and build upon each other to tell a coherent visual story about the fun fact.
-            - The total number of scenes should not exceed {max_scenes}.
-
-            Use only the following options for camera, lighting, and transition details:
-            - Camera: medium shot, full body shot, or wide shot
-            - Lighting: natural lighting, soft lighting, or three-point lighting
-            - Transition: zoom-in and zoom-out
-
-            Guidelines for using zoom-in, and zoom-out transitions:
-            - Zoom-in: Use to focus on important details, build tension, or show a character's point of view. Examples: revealing a clue, emphasizing a character's reaction, or creating suspense.
-            - Zoom-out: Use to reveal context, end a scene, or show isolation. Examples: showing a character in a larger environment, concluding a sequence, or transitioning from a detail to a wider view.
-
-            Important rules:
-            1. Do not use zoom-in transitions when the current scene's shot size is close-up or extreme close-up.
-            2. Logical consistency: Ensure camera, lighting, and composition choices match the scene content. For example:
-                - Don't use two-shot for scenes with only one character.
-                - Don't describe three-point lighting for a single character scene.
-                - Avoid using over-the-shoulder shots when there's no dialogue.
-                - Don't use natural lighting for indoor scenes without windows.
-                - Ensure the camera description matches the physical space of the scene.
-            3. For transitions, use ONLY the following types:
-                - zoom-in
-                - zoom-out
-            4. DO NOT use any other transition types, including shake, dissolve, or cut.
-
-            Output the result as a JSON object with the following structure:
-            {{
-                "project_info": {{
-                    "title": "{title}",
-                    "user": "AI Generated",
-                    "timestamp": "{timestamp}"
-                }},
-                "storyboards": [
-                    {{
-                        "scene_number": "Scene Number",
-                        "description": "Scene Description",
-                        "subtitles": "Subtitles or Dialogue",
-                        "image": null,
-                        "camera": {{
-                            "angle": "Camera Angle",
-                            "composition_type": "Composition Type",
-                            "shot_size": "Shot Size"
-                        }},
-                        "lighting": "Lighting Type",
-                        "transition_type": "Transition Type"
-                    }},
-                    ...
-                ]
-            }}
-
-            Here's the fun fact:
-
-        {story}"""
-
-        messages = [
-            {
-                "role": "system",
-                "content": '''You are a highly skilled storyboard artist specializing in visualizing educational content and fun facts. You excel at:
-                    1. Creating vivid, engaging scene descriptions that translate informational content into compelling visuals
-                    2. Developing visual metaphors and analogies to represent complex ideas or statistics
-                    3. Crafting scenes that show the real-world applications or implications of the information
-                    4. Incorporating basic cinematographic techniques to enhance visual storytelling of educational content
-                    5. Faithfully representing the original text using exact quotes for subtitles
-                    6. Ensuring the visual narrative accurately captures key points and their development
-                    7. Balancing informative content with visually interesting and engaging scenes
-                    8. Maintaining logical consistency between scenes while providing a variety of visual representations
-
-                    Your storyboards effectively bridge the gap between factual information and visual representation, 
-                    paying close attention to both the overall flow of information and specific details that enhance 
-                    the communication of the fun fact.'''
-            },
-            {"role": "user", "content": prompt},
-        ]
-
-        response = await call_openai_api(self.client, messages)
-        if not response:
-            logger.error("API returned empty response")
-            return create_empty_storyboard(title)
-        
-        # Find the JSON part of the response
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            try:
-                storyboard_data = json.loads(json_str)
-                return storyboard_data
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON Decode Error: {e}")
-                logger.error(f"Failed to parse JSON: {json_str}")
-                return create_empty_storyboard(title)
-        else:
-            logger.error("No JSON object found in the response")
-            logger.error(f"Full response: {response}")
-            return create_empty_storyboard(title)
-
-    async def _generate_general_storyboard(self, title: str, story: str, character_names: List[str]) -> Dict[str, Any]:
-        max_scenes = self.config.storyboard.get('max_scenes', 12)
-        timestamp = datetime.now().strftime("%Y-%m-%d %I:%M:%S %p")
-
-        prompt = f"""Based on the following story, create a detailed storyboard with up to {max_scenes} scenes.
-
-            Story Title: {title}
-            Character full Names: {', '.join(character_names)}
-
-            First, create an opening scene:
-            1. Scene Number: 1
-            2. Description: A vivid description (60-70 words) that sets up an engaging question related to the overall theme of the story. 
-            3. Subtitles: An engaging question that captures the essence of the story and piques the viewer's interest.
-            4. Camera, Lighting, and Transition: As per the guidelines below.
-
-            Then, for each subsequent scene, provide the following details:
-            1. Scene Number
-            2. Description: A vivid description (60-70 words) focusing on key visual elements.
-            3. Subtitles: Use EXACT quotes from the original story. 
-            4. Camera: Specify the angle, composition type, and shot size.
-            5. Lighting: Describe the lighting type used.
-            6. Transition: Specify the type of transition to the current scene.
-
-            Guidelines:
-            - Subtitles MUST contain only exact text from the original story, without any additions, omissions, or modifications.
-            - Include every sentence from the original story in the subtitles, maintaining the correct order across all scenes.
-            - Each subtitle must be unique; do not repeat content in multiple scenes.
-            - For partial sentences at scene boundaries, include the fragment and continue it in the next scene's subtitles.
-            - EVERY SCENE MUST HAVE NON-EMPTY SUBTITLES. If you run out of story text, do not create additional scenes.
-            - Adapt the storyboard to the specific story type (bedtime story, or other).
-            - For bedtime stories, ensure the scenes are soothing and appropriate for children.
-            - For other story types, capture the essence and genre of the story.
-            - Select scenes that represent pivotal moments or significant changes in the story.
-            - Ensure that the scenes flow logically and capture the essence of the story.
-            - Describe characters' clothing in detail, ensuring consistency within scenes.
-            - Cover the entire story without omitting any significant parts.
-            - Use the provided character full names in the descriptions.
-            - The total number of scenes should not exceed {max_scenes}.
-            - When using a character's name in possessive form (e.g., "Character's") in the description, 
-              surround it with double curly braces {{{{ }}}} if it's not referring to the character's appearance. 
-              For example: "{{{{Giovanni's}}}} workshop" or "The mysterious figure stood at the entrance of {{{{Giovanni's}}}} laboratory."
-
-            Use only the following options for camera, lighting, and transition details:
-            - Camera angles: low angle, high angle, Dutch angle, bird's eye view, worm's eye view, eye level, canted angle
-            - Composition types: single shot, two-shot, over-the-shoulder, insert shot, establishing shot
-            - Shot sizes: extreme close-up, close-up, medium shot, full body shot, long shot, wide shot, extreme long shot
-            - Lighting types: three-point lighting, high-key lighting, low-key lighting, natural lighting, practical lighting, motivated lighting, rim lighting, soft lighting, hard lighting, silhouette lighting
-            - Transition types: zoom-in, zoom-out
-
-            Guidelines for using zoom-in, and zoom-out transitions:
-            - Zoom-in: Use to focus on important details, build tension, or show a character's point of view. Examples: revealing a clue, emphasizing a character's reaction, or creating suspense.
-            - Zoom-out: Use to reveal context, end a scene, or show isolation. Examples: showing a character in a larger environment, concluding a sequence, or transitioning from a detail to a wider view.
-
-            Important rules:
-            1. Do not use zoom-in transitions when the current scene's shot size is close-up or extreme close-up.
-            2. Logical consistency: Ensure camera, lighting, and composition choices match the scene content. For example:
-                - Don't use two-shot for scenes with only one character.
-                - Don't describe three-point lighting for a single character scene.
-                - Avoid using over-the-shoulder shots when there's no dialogue.
-                - Don't use natural lighting for indoor scenes without windows.
-                - Ensure the camera description matches the physical space of the scene.
-            3. For transitions, use ONLY the following types:
-                - zoom-in
-                - zoom-out
-            4. DO NOT use any other transition types, including fade, dissolve, or cut.
-
-            Output the result as a JSON object with the following structure:
-            {{
-                "project_info": {{
-                    "title": "{title}",
-                    "user": "AI Generated",
-                    "timestamp": "{timestamp}"
-                }},
-                "storyboards": [
-                    {{
-                        "scene_number": "Scene Number",
-                        "description": "Scene Description",
-                        "subtitles": "Subtitles or Dialogue",
-                        "image": null,
-                        "camera": {{
-                            "angle": "Camera Angle",
-                            "composition_type": "Composition Type",
-                            "shot_size": "Shot Size"
-                        }},
-                        "lighting": "Lighting Type",
-                        "transition_type": "Transition Type"
-                    }},
-                    ...
-                ]
-            }}
-
-            Here's the story:
-
-        {story}"""
-
-        messages = [
-            {
-                "role": "system",
-                "content": '''You are a highly skilled storyboard artist with a keen eye for visual storytelling. You excel at:
-                    1. Creating vivid, cinematic scene descriptions easily translatable into compelling images
-                    2. Adapting to various story genres and styles while maintaining the original narrative's essence
-                    3. Incorporating basic cinematographic techniques into your descriptions
-                    4. Faithfully representing the original story using exact quotes for subtitles
-                    5. Ensuring the visual narrative accurately captures key moments, emotions, and atmosphere
-                    6. Describing characters' clothing in detail and maintaining consistency within scenes
-                    7. Logically evolving characters' attire between scenes when appropriate
-                    8. Specifying camera angles, composition types, and shot sizes
-                    9. Describing appropriate lighting for each scene
-                    10. Determining suitable transitions between scenes
-                    11. Adhering to fundamental filmmaking rules and best practices
-                    12. Maintaining logical consistency between scene content and technical descriptions
-
-                    Your storyboards effectively bridge the gap between written narrative and visual representation, 
-                    paying close attention to both the overall scene composition and specific details. You ensure 
-                    that all technical descriptions (camera, lighting, composition) are logically consistent with 
-                    the scene content and character presence. Most importantly, you maintain absolute fidelity to 
-                    the original story text in the subtitles, using only exact quotes without any alterations.'''
-            },
-            {"role": "user", "content": prompt},
-        ]
-
-        response = await call_openai_api(self.client, messages)
-        if not response:
-            logger.error("API returned empty response")
-            return create_empty_storyboard(title)
-        
-        # Find the JSON part of the response
-        json_match = re.search(r'\{.*\}', response, re.DOTALL)
-        if json_match:
-            json_str = json_match.group()
-            try:
-                storyboard_data = json.loads(json_str)
-                return storyboard_data
-            except json.JSONDecodeError as e:
-                logger.error(f"JSON Decode Error: {e}")
-                logger.error(f"Failed to parse JSON: {json_str}")
-                return create_empty_storyboard(title)
-        else:
-            logger.error("No JSON object found in the response")
-            logger.error(f"Full response: {response}")
-            return create_empty_storyboard(title)
-
-
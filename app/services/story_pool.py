@@ -0,0 +1,145 @@
+import asyncio
+from uuid import uuid4
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from app.core.config import settings
+from app.core.logging import logger
+from app.constants.story_types import STORY_TYPES_WITHOUT_CHARACTERS
+from app.models.story_bundle import StoryBundle
+from app.services.story_generator import StoryGenerator
+
+
+class StoryPool:
+    """
+    Warm pool of pre-generated story bundles (story, characters, storyboard).
+
+    Steps 1-3 of a task only depend on story type, language and duration, so
+    for the combinations listed in story_pool.combinations workers keep
+    story_pool.size bundles ready in the story_bundles table. A task claims
+    one atomically and goes straight to the scene pipeline; claiming wakes
+    the refill loop. Bundles older than story_pool.max_age_hours are never
+    claimed and get dropped. Every worker runs the loop, but only the one
+    holding the refill advisory lock generates bundles, so the pool never
+    overshoots by the number of workers.
+    """
+
+    def __init__(self, story_generator: StoryGenerator):
+        pool_config = settings.story_pool or {}
+        self.story_generator = story_generator
+        self.enabled = pool_config.get('enabled', False)
+        self.size = pool_config.get('size', 2)
+        self.refill_interval = pool_config.get('refill_interval', 60)
+        self.refill_concurrency = pool_config.get('refill_concurrency', 2)
+        self.max_age = timedelta(hours=pool_config.get('max_age_hours', 24))
+        self.combinations: List[Tuple[str, str, str]] = [
+            (c['story_type'].lower(), c['language'].lower(), c['duration'].lower())
+            for c in pool_config.get('combinations', [])
+        ]
+        self.concurrent_characters = (settings.storyboard or {}).get('concurrent_characters', False)
+        self._wake = asyncio.Event()
+
+    async def claim(self, story_type: str, language: str, duration: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            bundle = await StoryBundle.claim(story_type, language, duration, self.max_age)
+        except Exception as e:
+            logger.error(f"Error claiming story bundle: {str(e)}")
+            return None
+        if bundle is None:
+            return None
+        self._wake.set()
+        logger.info(f"Claimed pre-generated story bundle {bundle.id} for {story_type}/{language}/{duration}")
+        return {
+            "title": bundle.title,
+            "description": bundle.description,
+            "story": bundle.story,
+            "characters": bundle.characters,
+            "storyboard": bundle.storyboard,
+        }
+
+    async def generate_bundle(self, story_type: str, language: str, duration: str) -> bool:
+        title, description, story = await self.story_generator.generate_story_and_title(story_type, language, duration)
+        if not title or not story:
+            return False
+        if story_type in STORY_TYPES_WITHOUT_CHARACTERS:
+            characters = []
+            storyboard = await self.story_generator.generate_storyboard(story_type, title, story, [])
+        elif self.concurrent_characters:
+            characters, storyboard = await asyncio.gather(
+                self.story_generator.generate_characters(story),
+                self.story_generator.generate_storyboard(story_type, title, story, None),
+            )
+        else:
+            characters = await self.story_generator.generate_characters(story)
+            storyboard = await self.story_generator.generate_storyboard(story_type, title, story, [c["name"] for c in characters])
+        if not storyboard.get("storyboards"):
+            return False
+        storyboard["characters"] = characters
+        bundle = await StoryBundle.create(
+            id=str(uuid4()),
+            story_type=story_type,
+            language=language,
+            duration=duration,
+            title=title,
+            description=description,
+            story=story,
+            characters=characters,
+            storyboard=storyboard,
+        )
+        return bundle is not None
+
+    async def refill_once(self) -> int:
+        """
+        Top every configured combination up to `size` bundles; returns how many
+        were added. Does nothing while another worker is refilling.
+        """
+        async with StoryBundle.refill_lock() as acquired:
+            if not acquired:
+                return 0
+            return await self._refill()
+
+    async def _refill(self) -> int:
+        dropped = await StoryBundle.delete_older_than(datetime.now(timezone.utc) - self.max_age)
+        if dropped:
+            logger.info(f"Dropped {dropped} stale story bundle(s)")
+
+        counts = await StoryBundle.counts()
+        missing = [
+            combination
+            for combination in self.combinations
+            for _ in range(max(0, self.size - counts.get(combination, 0)))
+        ]
+        if not missing:
+            return 0
+
+        semaphore = asyncio.Semaphore(self.refill_concurrency)
+
+        async def fill(combination: Tuple[str, str, str]) -> bool:
+            async with semaphore:
+                try:
+                    return await self.generate_bundle(*combination)
+                except Exception as e:
+                    logger.error(f"Error pre-generating story bundle for {'/'.join(combination)}: {str(e)}")
+                    return False
+
+        added = sum(await asyncio.gather(*[fill(combination) for combination in missing]))
+        logger.info(f"Story pool refill added {added}/{len(missing)} bundle(s)")
+        return added
+
+    async def run(self, stopping: asyncio.Event):
+        logger.info(f"Story pool refilling {len(self.combinations)} combination(s) to {self.size} bundle(s) each")
+        while not stopping.is_set():
+            self._wake.clear()
+            try:
+                await self.refill_once()
+            except Exception as e:
+                logger.error(f"Error refilling story pool: {str(e)}")
+
+            wake = asyncio.create_task(self._wake.wait())
+            stop = asyncio.create_task(stopping.wait())
+            try:
+                await asyncio.wait({wake, stop}, timeout=self.refill_interval, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                wake.cancel()
+                stop.cancel()
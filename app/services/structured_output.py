@@ -0,0 +1,146 @@
+import re
+import json
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+from pydantic import BaseModel, ValidationError
+from app.core.config import settings
+from app.core.logging import logger
+from app.schemas.story import Scene, Storyboard
+from app.utils.helpers import call_openai_api
+
+T = TypeVar("T", bound=BaseModel)
+
+
+class StructuredOutputError(ValueError):
+    pass
+
+
+def structured_output_mode() -> Optional[str]:
+    """
+    "json_schema", "json_object" or None, from openai.structured_output.
+
+    Azure deployments on API versions before 2024-08-01-preview don't accept
+    json_schema response formats, so they fall back to plain JSON mode.
+    """
+    mode = (settings.openai or {}).get('structured_output', 'json_schema')
+    if not mode:
+        return None
+    if mode == "json_schema" and settings.use_azure_openai and (settings.azure_api_version or "") < "2024-08-01-preview":
+        return "json_object"
+    return mode
+
+
+def response_format_for(model_cls: Type[BaseModel]) -> Optional[Dict[str, Any]]:
+    mode = structured_output_mode()
+    if mode == "json_schema":
+        return {
+            "type": "json_schema",
+            "json_schema": {"name": model_cls.__name__, "schema": model_cls.model_json_schema(), "strict": False},
+        }
+    if mode == "json_object":
+        return {"type": "json_object"}
+    return None
+
+
+def extract_json(text: str) -> Any:
+    """
+    Parse JSON from a model response, repairing the usual formatting drift:
+    code fences, prose around the JSON and trailing commas.
+    """
+    if text is None:
+        raise StructuredOutputError("Empty response")
+    cleaned = re.sub(r'^\s*```(?:json)?\s*|\s*```\s*$', '', text.strip())
+    try:
+        return json.loads(cleaned)
+    except json.JSONDecodeError:
+        pass
+
+    starts = [i for i in (cleaned.find('{'), cleaned.find('[')) if i != -1]
+    if not starts:
+        raise StructuredOutputError("No JSON found in the response")
+    start = min(starts)
+    end = cleaned.rfind('}' if cleaned[start] == '{' else ']')
+    candidate = re.sub(r',\s*([}\]])', r'\1', cleaned[start:end + 1])
+    try:
+        return json.loads(candidate)
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Invalid JSON: {e}") from e
+
+
+def validate_scenes(raw_scenes: Any) -> List[Dict[str, Any]]:
+    """
+    Validate storyboard scenes one by one, dropping the ones that can't be
+    repaired (e.g. empty subtitles) and renumbering the rest in order.
+    """
+    if not isinstance(raw_scenes, list):
+        raise StructuredOutputError("storyboards is not a list")
+    scenes = []
+    for raw_scene in raw_scenes:
+        try:
+            scene = Scene.model_validate(raw_scene)
+        except ValidationError as e:
+            logger.warning(f"Dropping invalid storyboard scene: {e.errors()[0]['msg'] if e.errors() else e}")
+            continue
+        scene.scene_number = len(scenes) + 1
+        scenes.append(scene.model_dump())
+    return scenes
+
+
+def parse_model(model_cls: Type[T], text: str) -> T:
+    data = extract_json(text)
+    # A bare array is accepted for models that wrap a single list field
+    fields = list(model_cls.model_fields)
+    if isinstance(data, list) and len(fields) == 1:
+        data = {fields[0]: data}
+    try:
+        return model_cls.model_validate(data)
+    except ValidationError as e:
+        raise StructuredOutputError(str(e)) from e
+
+
+def parse_storyboard(text: str) -> Storyboard:
+    """
+    Storyboards are repaired scene by scene rather than rejected as a whole.
+    """
+    data = extract_json(text)
+    if isinstance(data, list):
+        data = {"storyboards": data}
+    if not isinstance(data, dict):
+        raise StructuredOutputError("Storyboard is not a JSON object")
+    scenes = validate_scenes(data.get("storyboards"))
+    if not scenes:
+        raise StructuredOutputError("Storyboard has no valid scenes")
+    return Storyboard.model_validate({"storyboards": scenes})
+
+
+async def request_structured(client, messages: List[Dict[str, str]], model_cls: Type[T], parse: Optional[Callable[[str], T]] = None, max_retries: Optional[int] = None, stage: Optional[str] = None) -> Optional[T]:
+    """
+    Call the chat API for a response matching model_cls.
+
+    Uses a JSON-schema (or JSON-mode) response format where supported and
+    repairs the response locally. If it still doesn't validate, only this call
+    is retried, with the validation error fed back to the model. A failed API
+    call is not retried here, since the rate limiter has already done so. `stage`
+    selects the model through openai.stage_models.
+    """
+    if max_retries is None:
+        max_retries = (settings.openai or {}).get('structured_output_retries', 1)
+    parse = parse or (lambda text: parse_model(model_cls, text))
+    response_format = response_format_for(model_cls)
+    kwargs = {"response_format": response_format} if response_format else {}
+
+    for attempt in range(max_retries + 1):
+        response = await call_openai_api(client, messages, stage=stage, **kwargs)
+        if response is None:
+            # The rate limiter already retried the call itself; don't stack another round on top
+            logger.error(f"No {model_cls.__name__} response from the API")
+            return None
+        try:
+            return parse(response)
+        except StructuredOutputError as e:
+            logger.warning(f"Invalid {model_cls.__name__} response (attempt {attempt + 1}/{max_retries + 1}): {str(e)[:500]}")
+            messages = messages + [
+                {"role": "assistant", "content": response},
+                {"role": "user", "content": f"Your response could not be parsed: {str(e)[:1000]}\nReply again with only the corrected JSON."},
+            ]
+    logger.error(f"Giving up on {model_cls.__name__} response after {max_retries + 1} attempts")
+    return None
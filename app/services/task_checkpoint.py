@@ -0,0 +1,50 @@
+import os
+import json
+from typing import Any, Dict, Optional
+from app.core.logging import logger
+from app.services.task_state import task_state
+
+
+class TaskCheckpoint:
+    """
+    Stage results of one video task, persisted in video_tasks.checkpoint.
+
+    A retried or resumed task starts from its checkpoint and skips every stage
+    whose result is recorded there: story, characters, storyboard (including
+    each scene's image URL), per-scene audio and segment files, and whether the
+    image rows were saved. Files only count while they still exist on disk, so
+    a task resumed on another host regenerates them.
+
+    save() hands the checkpoint to the task-state service, which writes it
+    together with the task's buffered progress once per debounce window.
+    persist() writes it right away, for results that must not be redone.
+    """
+
+    def __init__(self, task_id: str, data: Optional[Dict[str, Any]] = None):
+        self.task_id = task_id
+        self.data: Dict[str, Any] = dict(data or {})
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def scene(self, scene_number: Any) -> Dict[str, Any]:
+        return self.data.setdefault("scenes", {}).setdefault(str(scene_number), {})
+
+    def scene_file(self, scene_number: Any, key: str) -> Optional[str]:
+        path = self.data.get("scenes", {}).get(str(scene_number), {}).get(key)
+        return path if path and os.path.exists(path) else None
+
+    def _snapshot(self) -> Dict[str, Any]:
+        # Scenes keep changing the live dict, so the buffered copy is taken now
+        return json.loads(json.dumps(self.data, default=str))
+
+    def save(self, **fields) -> None:
+        self.data.update(fields)
+        task_state.report_checkpoint(self.task_id, self._snapshot())
+
+    async def persist(self, **fields) -> None:
+        self.data.update(fields)
+        try:
+            await task_state.update(self.task_id, checkpoint=self._snapshot())
+        except Exception as e:
+            logger.error(f"Error saving checkpoint for VideoTask {self.task_id}: {str(e)}")
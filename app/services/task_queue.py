@@ -0,0 +1,106 @@
+import os
+import socket
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy import select, update
+from sqlalchemy.exc import SQLAlchemyError
+from app.core.config import settings
+from app.core.logging import logger
+from app.db.session import async_session
+from app.models.video_task import VideoTask
+
+
+class TaskQueue:
+    """
+    Durable video task queue backed by the video_tasks table.
+
+    Tasks wait with status "queued". A worker claims one with
+    SELECT ... FOR UPDATE SKIP LOCKED, so concurrent workers never pick the same
+    row, and keeps its lease alive with heartbeats. Tasks whose worker stopped
+    heartbeating are put back in the queue (or failed after max_attempts).
+    """
+
+    def __init__(self, worker_id: Optional[str] = None):
+        worker_config = settings.worker or {}
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.lease_timeout = worker_config.get('lease_timeout', 120)
+        self.max_attempts = worker_config.get('max_attempts', 3)
+
+    async def claim(self) -> Optional[VideoTask]:
+        try:
+            async with async_session() as session:
+                async with session.begin():
+                    query = (
+                        select(VideoTask)
+                        .where(VideoTask.status == "queued")
+                        .order_by(VideoTask.created_at)
+                        .limit(1)
+                        .with_for_update(skip_locked=True)
+                    )
+                    task = (await session.execute(query)).scalars().first()
+                    if task is None:
+                        return None
+                    task.status = "processing"
+                    task.worker_id = self.worker_id
+                    task.heartbeat_at = datetime.now(timezone.utc)
+                    task.attempts = (task.attempts or 0) + 1
+            logger.info(f"Worker {self.worker_id} claimed VideoTask {task.id} (attempt {task.attempts})")
+            return task
+        except SQLAlchemyError as e:
+            logger.error(f"Error claiming VideoTask: {e}")
+            return None
+
+    async def heartbeat(self, task_id: str) -> bool:
+        async with async_session() as session:
+            result = await session.execute(
+                update(VideoTask)
+                .where(VideoTask.id == task_id, VideoTask.worker_id == self.worker_id)
+                .values(heartbeat_at=datetime.now(timezone.utc))
+            )
+            await session.commit()
+            return result.rowcount > 0
+
+    async def release(self, task_id: str) -> None:
+        """
+        Give up the lease once processing returned. A task still marked
+        processing at that point ended without reaching a final status, so it is
+        failed (and can be resumed) rather than left without an owner.
+        """
+        owned = (VideoTask.id == task_id, VideoTask.worker_id == self.worker_id)
+        async with async_session() as session:
+            unfinished = await session.execute(
+                update(VideoTask)
+                .where(*owned, VideoTask.status.in_(("queued", "processing")))
+                .values(status="failed", worker_id=None, heartbeat_at=None, error_message="Processing stopped before the task finished")
+            )
+            await session.execute(
+                update(VideoTask)
+                .where(*owned)
+                .values(worker_id=None, heartbeat_at=None)
+            )
+            await session.commit()
+        if unfinished.rowcount:
+            logger.warning(f"VideoTask {task_id} was left unfinished by worker {self.worker_id}, marked failed")
+
+    async def recover_abandoned(self) -> int:
+        """
+        Requeue tasks whose lease expired, or fail them once they ran out of attempts.
+        """
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.lease_timeout)
+        abandoned = (VideoTask.status == "processing", VideoTask.worker_id.isnot(None), VideoTask.heartbeat_at < cutoff)
+        async with async_session() as session:
+            requeued = await session.execute(
+                update(VideoTask)
+                .where(*abandoned, VideoTask.attempts < self.max_attempts)
+                .values(status="queued", worker_id=None, heartbeat_at=None)
+            )
+            failed = await session.execute(
+                update(VideoTask)
+                .where(*abandoned, VideoTask.attempts >= self.max_attempts)
+                .values(status="failed", worker_id=None, heartbeat_at=None, error_message="Task abandoned by worker too many times")
+            )
+            await session.commit()
+
+        if requeued.rowcount or failed.rowcount:
+            logger.warning(f"Recovered abandoned VideoTasks: {requeued.rowcount} requeued, {failed.rowcount} failed")
+        return requeued.rowcount + failed.rowcount
@@ -0,0 +1,86 @@
+import asyncio
+from typing import Any, Dict, Optional
+from app.core.config import settings
+from app.core.logging import logger
+from app.models.video_task import VideoTask
+
+
+class TaskStateService:
+    """
+    Coalesces writes to video_tasks rows.
+
+    Status changes are written immediately as a single UPDATE (merged with any
+    pending progress for the same task). Progress ticks and checkpoint snapshots
+    are buffered per task and flushed once per debounce window, so a burst of
+    them costs one statement. Flushes never lower progress or touch a task that
+    is no longer processing.
+    """
+
+    def __init__(self, debounce: Optional[float] = None):
+        self.debounce = debounce if debounce is not None else (settings.worker or {}).get('progress_debounce', 1.0)
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._flushers: Dict[str, asyncio.Task] = {}
+
+    def _take_pending(self, task_id: str) -> Dict[str, Any]:
+        flusher = self._flushers.pop(task_id, None)
+        if flusher is not None and flusher is not asyncio.current_task():
+            flusher.cancel()
+        return self._pending.pop(task_id, {})
+
+    async def update(self, task_id: str, **fields) -> bool:
+        """
+        Write fields now, together with any buffered progress for the task.
+        """
+        values = {**self._take_pending(task_id), **fields}
+        if not values:
+            return True
+        return bool(await VideoTask.update(task_id, refresh=False, **values))
+
+    def report_progress(self, task_id: str, progress: float, **fields) -> None:
+        """
+        Buffer a progress update; it is written within the debounce window.
+        """
+        pending = self._pending.setdefault(task_id, {})
+        pending.update(fields)
+        pending['progress'] = max(progress, pending.get('progress', 0.0))
+        self._schedule_flush(task_id)
+
+    def report_checkpoint(self, task_id: str, checkpoint: Dict[str, Any]) -> None:
+        """
+        Buffer a checkpoint snapshot; only the latest one is written, together
+        with the task's pending progress.
+        """
+        self._pending.setdefault(task_id, {})['checkpoint'] = checkpoint
+        self._schedule_flush(task_id)
+
+    def _schedule_flush(self, task_id: str) -> None:
+        if task_id not in self._flushers:
+            self._flushers[task_id] = asyncio.create_task(self._flush_later(task_id))
+
+    async def _flush_later(self, task_id: str):
+        await asyncio.sleep(self.debounce)
+        try:
+            await self.flush(task_id)
+        except Exception as e:
+            logger.error(f"Error flushing progress for VideoTask {task_id}: {str(e)}")
+
+    async def flush(self, task_id: str) -> None:
+        # A flush that already took its values can still commit after a later
+        # update(), so it only ever moves progress forward on a running task
+        values = self._take_pending(task_id)
+        if values:
+            await VideoTask.update_progress(task_id, **values)
+
+    def discard(self, task_id: str) -> None:
+        """
+        Drop buffered writes for a task this process no longer owns.
+        """
+        self._take_pending(task_id)
+
+    async def flush_all(self) -> None:
+        for task_id in list(self._pending):
+            await self.flush(task_id)
+
+
+# Shared by every task processed in this process
+task_state = TaskStateService()
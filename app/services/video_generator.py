@@ -1,95 +1,100 @@
 import os
 import asyncio
-from moviepy.editor import (
-    ImageClip,
-    concatenate_videoclips,
-    AudioFileClip
-)
 from app.services.audio_generator import AudioGenerator
-from app.utils.transitions import zoom 
-import shortcap
+from app.services.render_executor import RenderExecutor, ProgressCallback
+from app.services.video_renderer import render_video, render_scene_segment, concat_segments
 from app.core.config import settings
 from app.core.logging import logger
 from app.utils.image_utils import download_image
+from typing import Any, Dict, List, Optional
 
 class VideoGenerator:
+    """
+    Per-scene building blocks for the video pipeline.
+
+    Each scene's narration, image download and segment render can run as soon
+    as its own inputs are ready; join_scenes stream-copies the finished
+    segments' video into the final video and re-encodes the audio once. With
+    video.parallel_scenes set to false, scenes stop after their assets and
+    render_video encodes them all in a single pass instead.
+    """
+
     def __init__(self, client):
         self.audio_generator = AudioGenerator(client)
-        self.font_path = os.path.join(settings.BASE_DIR, "resources/fonts")
+        self.asset_concurrency = (settings.video or {}).get('asset_concurrency', 8)
+        self.fps = (settings.video or {}).get('fps', 24)
+        self.parallel_scenes = (settings.video or {}).get('parallel_scenes', True)
+        self.asset_semaphore = asyncio.Semaphore(self.asset_concurrency)
+        self.render_executor = RenderExecutor()
 
-    async def add_captions(self, output_file, output_file_subtitle):
-        shortcap.add_captions(
-            video_file=output_file,
-            output_file=output_file_subtitle,
-            font=os.path.join(self.font_path, "TitanOne.ttf"),
-            font_size=70,
-            font_color="white",
-            stroke_width=3,
-            stroke_color="black",
-            shadow_strength=1.0,
-            shadow_blur=0.1,
-            highlight_current_word=True,
-            word_highlight_color="yellow",
-            line_count=1,
-            padding=70,
-            position="bottom",
-            use_local_whisper=False,
-        )
-
-    async def generate_video(self, storyboard_project, story_dir, voice_name):
+    async def generate_scene_audio(self, scene: Dict[str, Any], story_dir: str, voice_name: str) -> Optional[str]:
         audio_dir = os.path.join(story_dir, "audio")
         os.makedirs(audio_dir, exist_ok=True)
-        video_path = os.path.join(story_dir, "story_video.mp4")
-        clips = []
-        try:
-            for scene in storyboard_project['storyboards']:
-                # Generate audio for the subtitle
-                audio_file = os.path.join(audio_dir, f"scene_{scene['scene_number']}.mp3")
-                success = await self.audio_generator.generate_audio(scene['subtitles'], audio_file, voice_name)
-                if not success:
-                    logger.error(f"Failed to generate audio for scene {scene['scene_number']}")
-                    continue
-
-                # Create audio clip
-                audio_clip = AudioFileClip(audio_file)
-                
-                # Download and use the image
-                image_path = os.path.join(story_dir, f"scene_{scene['scene_number']}.png")
-                downloaded_image = await download_image(scene['image'], image_path)
-                
-                if downloaded_image is None:
-                    logger.error(f"Skipping scene {scene['scene_number']} due to image download failure")
-                    continue
-                
-                # Create image clip with duration matching the audio
-                image_clip = ImageClip(downloaded_image).set_duration(audio_clip.duration)
-                
-                # Combine image, text, and audio
-                video_clip = image_clip.set_audio(audio_clip)
+        audio_file = os.path.join(audio_dir, f"scene_{scene['scene_number']}.mp3")
+        async with self.asset_semaphore:
+            success = await self.audio_generator.generate_audio(scene['subtitles'], audio_file, voice_name)
+        if not success:
+            logger.error(f"Failed to generate audio for scene {scene['scene_number']}")
+            return None
+        return audio_file
 
-                # Apply transition effect
-                transition_type = scene['transition_type']
-                    
-                if transition_type == 'zoom-in':
-                    clips.append(zoom(video_clip))
-                elif transition_type == 'zoom-out':
-                    clips.append(zoom(video_clip, mode='out'))
-                else:
-                    clips.append(video_clip)
+    async def download_scene_image(self, scene: Dict[str, Any], image_url: str, story_dir: str) -> Optional[str]:
+        image_path = os.path.join(story_dir, f"scene_{scene['scene_number']}.png")
+        async with self.asset_semaphore:
+            downloaded_image = await download_image(image_url, image_path)
+        if downloaded_image is None:
+            logger.error(f"Skipping scene {scene['scene_number']} due to image download failure")
+        return downloaded_image
 
-            if not clips:
-                logger.error("No valid clips generated")
-                return None
+    @staticmethod
+    def render_spec(scene: Dict[str, Any], audio_file: str, image_path: str) -> Dict[str, Any]:
+        """
+        The picklable description of a scene that the render processes work from.
+        """
+        return {
+            "scene_number": scene['scene_number'],
+            "audio_file": audio_file,
+            "image_path": image_path,
+            "transition_type": scene.get('transition_type'),
+            "subtitles": scene['subtitles'],
+        }
 
-            final_clip = concatenate_videoclips(clips)
-            
-            # Use a separate thread for video writing to avoid blocking the event loop
-            await asyncio.to_thread(final_clip.write_videofile, video_path, fps=24)
+    async def render_scene(self, render_scene: Dict[str, Any], story_dir: str, progress_callback: Optional[ProgressCallback] = None) -> str:
+        """
+        Build, caption and encode one scene to its own segment in a render process.
+        """
+        segment_dir = os.path.join(story_dir, "segments")
+        os.makedirs(segment_dir, exist_ok=True)
+        return await self.render_executor.run(
+            render_scene_segment,
+            render_scene,
+            os.path.join(segment_dir, f"scene_{render_scene['scene_number']}.mp4"),
+            self.fps,
+            progress_callback=progress_callback
+        )
 
-            subtitle_video_path = video_path.replace('.mp4', '_subtitle.mp4')
-            await self.add_captions(video_path, subtitle_video_path)
+    async def render_video(self, render_scenes: List[Dict[str, Any]], story_dir: str, progress_callback: Optional[ProgressCallback] = None) -> Optional[str]:
+        """
+        Single-pass alternative to render_scene + join_scenes: build, caption and
+        encode all scenes into the final video in one render process.
+        """
+        if not render_scenes:
+            logger.error("No valid clips generated")
+            return None
+        video_path = os.path.join(story_dir, "story_video.mp4")
+        try:
+            return await self.render_executor.run(render_video, render_scenes, video_path, self.fps, progress_callback=progress_callback)
+        except Exception as e:
+            logger.error(f"Error rendering video: {str(e)}")
+            return None
 
-            return subtitle_video_path
+    async def join_scenes(self, segment_paths: List[str], story_dir: str) -> Optional[str]:
+        if not segment_paths:
+            logger.error("No valid clips generated")
+            return None
+        video_path = os.path.join(story_dir, "story_video.mp4")
+        try:
+            return await self.render_executor.run(concat_segments, segment_paths, video_path)
         except Exception as e:
-            logger.error(f"Error in generate_video: {str(e)}")
+            logger.error(f"Error joining scene segments: {str(e)}")
             return None
@@ -0,0 +1,181 @@
+"""
+CPU-bound video rendering.
+
+Everything here is synchronous and runs inside render worker processes
+(see app/services/render_executor.py), so scene specs and results are plain
+picklable values: dicts of file paths and text in, an output path out.
+"""
+import os
+import subprocess
+from typing import Any, Dict, List, Optional
+from moviepy.editor import (
+    ImageClip,
+    AudioFileClip,
+    concatenate_videoclips
+)
+from proglog import ProgressBarLogger
+from imageio_ffmpeg import get_ffmpeg_exe
+from app.core.config import settings
+from app.utils.transitions import zoom
+from app.utils.captions import CaptionRenderer
+from app.utils.word_alignment import align_audio_clip
+
+FONT_PATH = os.path.join(settings.BASE_DIR, "resources/fonts")
+
+# Every encode uses the same parameters so scene segments' video can be joined without re-encoding
+ENCODING_PARAMS = {
+    "codec": "libx264",
+    "audio_codec": "aac",
+    "audio_fps": 44100,
+    "preset": "medium",
+    "ffmpeg_params": ["-pix_fmt", "yuv420p"],
+}
+
+_caption_renderer = None
+
+
+def get_caption_renderer() -> CaptionRenderer:
+    # Loaded lazily so each render process opens the font once
+    global _caption_renderer
+    if _caption_renderer is None:
+        _caption_renderer = CaptionRenderer(
+            font_path=os.path.join(FONT_PATH, "TitanOne.ttf"),
+            font_size=70,
+            font_color="white",
+            stroke_width=3,
+            stroke_color="black",
+            shadow_strength=1.0,
+            shadow_blur=0.1,
+            highlight_current_word=True,
+            word_highlight_color="yellow",
+            line_count=1,
+            padding=70,
+            position="bottom",
+        )
+    return _caption_renderer
+
+
+class QueueProgressLogger(ProgressBarLogger):
+    """
+    Forwards moviepy's frame progress to the parent process as whole percentages.
+    """
+
+    def __init__(self, progress_queue):
+        super().__init__()
+        self.progress_queue = progress_queue
+        self.last_percent = -1
+
+    def bars_callback(self, bar, attr, value, old_value=None):
+        if bar != 't' or attr != 'index':
+            return
+        total = self.bars[bar].get('total') or 0
+        if not total:
+            return
+        percent = int(100 * value / total)
+        if percent != self.last_percent:
+            self.last_percent = percent
+            self.progress_queue.put(percent)
+
+
+def build_scene_clip(scene: Dict[str, Any], fps: int):
+    """
+    Build one scene: the still image with its zoom, its narration and burned-in captions.
+
+    scene is a dict with audio_file, image_path, transition_type and subtitles.
+    """
+    audio_clip = AudioFileClip(scene['audio_file'])
+
+    # Create image clip with duration matching the audio
+    image_clip = ImageClip(scene['image_path']).set_duration(audio_clip.duration)
+
+    # Combine image, text, and audio
+    video_clip = image_clip.set_audio(audio_clip)
+
+    # Apply transition effect
+    transition_type = scene.get('transition_type')
+    if transition_type == 'zoom-in':
+        video_clip = zoom(video_clip, fps=fps)
+    elif transition_type == 'zoom-out':
+        video_clip = zoom(video_clip, mode='out', fps=fps)
+
+    # Burn the scene's captions in the same render pass, timed against its own TTS audio
+    word_timings = align_audio_clip(scene['subtitles'], audio_clip)
+    return get_caption_renderer().apply(video_clip, word_timings), audio_clip
+
+
+def render_video(scenes: List[Dict[str, Any]], video_path: str, fps: int, progress_queue=None) -> Optional[str]:
+    """
+    Render all scenes into a single MP4 at video_path in one pass and return the path.
+    """
+    clips, audio_clips = [], []
+    try:
+        for scene in scenes:
+            clip, audio_clip = build_scene_clip(scene, fps)
+            clips.append(clip)
+            audio_clips.append(audio_clip)
+
+        if not clips:
+            return None
+
+        final_clip = concatenate_videoclips(clips)
+        write_clip(final_clip, video_path, fps, progress_queue)
+        return video_path
+    finally:
+        for audio_clip in audio_clips:
+            audio_clip.close()
+
+
+def write_clip(clip, output_path: str, fps: int, progress_queue=None):
+    logger = QueueProgressLogger(progress_queue) if progress_queue is not None else "bar"
+    # Keep moviepy's temporary audio next to the output so concurrent renders never collide
+    temp_audiofile = os.path.splitext(output_path)[0] + "_temp_audio.m4a"
+    clip.write_videofile(output_path, fps=fps, logger=logger, temp_audiofile=temp_audiofile, **ENCODING_PARAMS)
+
+
+def render_scene_segment(scene: Dict[str, Any], segment_path: str, fps: int, progress_queue=None) -> str:
+    """
+    Render a single scene to its own MP4 segment and return the path.
+    """
+    clip, audio_clip = build_scene_clip(scene, fps)
+    try:
+        write_clip(clip, segment_path, fps, progress_queue)
+        return segment_path
+    finally:
+        audio_clip.close()
+
+
+def concat_segments(segment_paths: List[str], video_path: str, progress_queue=None) -> str:
+    """
+    Join segments rendered with ENCODING_PARAMS using ffmpeg's concat demuxer.
+
+    Video is stream-copied. Audio is re-encoded once over the whole video:
+    copying independently encoded AAC keeps each segment's encoder priming and
+    padding, which clicks at every scene boundary and drifts out of sync.
+    """
+    list_path = os.path.splitext(video_path)[0] + "_segments.txt"
+    with open(list_path, "w") as f:
+        for segment_path in segment_paths:
+            escaped = os.path.abspath(segment_path).replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+
+    try:
+        subprocess.run(
+            [
+                get_ffmpeg_exe(), "-y", "-loglevel", "error",
+                "-f", "concat", "-safe", "0", "-i", list_path,
+                "-c:v", "copy",
+                "-c:a", ENCODING_PARAMS["audio_codec"], "-ar", str(ENCODING_PARAMS["audio_fps"]),
+                "-movflags", "+faststart",
+                video_path,
+            ],
+            check=True,
+            capture_output=True,
+        )
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"ffmpeg concat failed: {e.stderr.decode(errors='replace').strip()}") from e
+    finally:
+        os.remove(list_path)
+
+    if progress_queue is not None:
+        progress_queue.put(100)
+    return video_path
@@ -7,12 +7,16 @@ from app.models.image import Image
 from app.services.image_generator import ImageGenerator
 from app.services.video_generator import VideoGenerator 
 from app.utils.helpers import create_resource_dir
-from app.models.video_task import VideoTask
-from app.constants.story_types import STORY_TYPES
+from app.constants.story_types import STORY_TYPES, STORY_TYPES_WITHOUT_CHARACTERS
 from app.services.image_api import fal_flux_api, replicate_flux_api
 from app.core.logging import logger
 from app.services.storage import StorageService
+from app.services.task_state import task_state
+from app.services.progress_events import progress_broker
+from app.services.task_checkpoint import TaskCheckpoint
+from app.services.story_pool import StoryPool
 import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional
 import shutil
 
 class VideoTaskProcessor:
@@ -21,77 +25,245 @@ class VideoTaskProcessor:
             self.client = AsyncAzureOpenAI(
                 azure_endpoint=settings.AZURE_OPENAI_ENDPOINT,
                 api_key=settings.AZURE_OPENAI_API_KEY,
-                api_version=settings.azure_api_version
+                api_version=settings.azure_api_version,
+                max_retries=0  # retries are handled by the shared rate limiter
             )
         else:
             self.client = AsyncOpenAI(
                 api_key=settings.OPENAI_API_KEY,
-                base_url=settings.OPENAI_BASE_URL
+                base_url=settings.OPENAI_BASE_URL,
+                max_retries=0  # retries are handled by the shared rate limiter
             )
         self.story_generator = StoryGenerator(self.client)
+        self.story_pool = StoryPool(self.story_generator)
 
         # Choose the image generation function based on configuration
         image_gen_func = fal_flux_api if settings.use_fal_flux else replicate_flux_api
         self.image_generator = ImageGenerator(image_generator_func=image_gen_func)
         self.video_generator = VideoGenerator(self.client)
         self.storage_service = StorageService()
+        self.task_state = task_state
+        self.progress_broker = progress_broker
+        self.render_event_step = (settings.progress_events or {}).get('render_step', 5)
+        self.stream_storyboard = (settings.storyboard or {}).get('stream', False)
+        self.concurrent_characters = (settings.storyboard or {}).get('concurrent_characters', False)
 
-    async def process_video_generation_task(self, task_id: str, story_topic: str, art_style: str, duration: str, language: str, voice_name: str):
-        task = await VideoTask.get(task_id)
+    async def _complete_step(self, task_id: str, step: str, completed_steps: int, total_steps: int):
+        progress = round(completed_steps/total_steps, 1)
+        self.task_state.report_progress(task_id, progress)
+        await self.progress_broker.publish(task_id, "step", step=step, completed_steps=completed_steps, total_steps=total_steps, progress=progress)
+
+    async def _process_scene(self, task_id: str, index: int, scene: Dict[str, Any], total: Optional[int], get_characters: Callable[[], Awaitable[List[Dict[str, Any]]]], art_style: str, story_dir: str, voice_name: str, checkpoint: TaskCheckpoint, report_progress: Callable[[int, float], Awaitable[None]]) -> Optional[Dict[str, Any]]:
+        """
+        Produce one scene's assets and, with video.parallel_scenes, its own video
+        segment. Narration starts right away since it only needs the subtitles;
+        the image is downloaded as soon as it is generated. Anything already in
+        the checkpoint is reused. Returns the scene's render spec (with
+        segment_path when it was rendered), or None when it has to be skipped.
+        """
+        scene_number = scene['scene_number']
+        parallel_scenes = self.video_generator.parallel_scenes
+        segment_path = checkpoint.scene_file(scene_number, "segment_path") if parallel_scenes else None
+        if segment_path:
+            await report_progress(index, 1.0)
+            return {"scene_number": scene_number, "segment_path": segment_path}
+
+        audio_file = checkpoint.scene_file(scene_number, "audio_file")
+        audio_task = None if audio_file else asyncio.create_task(self.video_generator.generate_scene_audio(scene, story_dir, voice_name))
+        try:
+            image_path = checkpoint.scene_file(scene_number, "image_path")
+            if not image_path and scene.get("image"):
+                # Generated by an earlier attempt; only the download is missing
+                image_path = await self.video_generator.download_scene_image(scene, scene["image"], story_dir)
+            if not image_path:
+                # Character descriptions may still be generating; only the image needs them
+                image_url = await self.image_generator.generate_scene_image(task_id, index, total, scene, await get_characters(), art_style)
+                checkpoint.save()
+                image_path = await self.video_generator.download_scene_image(scene, image_url, story_dir) if image_url else None
+            if audio_task is not None:
+                audio_file = await audio_task
+        finally:
+            if audio_task is not None and not audio_task.done():
+                audio_task.cancel()
+
+        if not image_path or not audio_file:
+            await report_progress(index, 1.0)
+            return None
+        checkpoint.scene(scene_number).update(image_path=image_path, audio_file=audio_file)
+        checkpoint.save()
+        render_scene = self.video_generator.render_spec(scene, audio_file, image_path)
+        if not parallel_scenes:
+            # Rendered together with the other scenes in step 6
+            await report_progress(index, 1.0)
+            return render_scene
+        await report_progress(index, 0.5)
+
+        async def report_render_progress(percent: int):
+            await report_progress(index, 0.5 + percent / 200)
+
+        segment_path = await self.video_generator.render_scene(render_scene, story_dir, progress_callback=report_render_progress)
+        checkpoint.scene(scene_number)["segment_path"] = segment_path
+        checkpoint.save()
+        render_scene["segment_path"] = segment_path
+        return render_scene
+
+    async def process_video_generation_task(self, task_id: str, story_topic: str, art_style: str, duration: str, language: str, voice_name: str, checkpoint_data: Optional[Dict[str, Any]] = None):
         total_steps = 6  # Total number of main steps in the process
         completed_steps = 0
+        # Results of stages completed by an earlier attempt of this task
+        checkpoint = TaskCheckpoint(task_id, checkpoint_data)
 
         try:
-            await task.update(task_id=task_id, status="processing", progress=0)
+            await self.task_state.update(task_id, status="processing", progress=0)
+            await self.progress_broker.publish(task_id, "status", status="processing", progress=0)
 
-            # Step 1: Generate story and title
+            # Steps 1-3 are skipped entirely when a pre-generated bundle is available
             story_type = self.map_topic_to_story_type(story_topic)
-            title, description, story = await self.story_generator.generate_story_and_title(story_type, language, duration)
-            if not title or not story:
-                raise ValueError("Failed to generate story and title")
+            if not checkpoint.get("story"):
+                bundle = await self.story_pool.claim(story_type, language, duration)
+                if bundle:
+                    checkpoint.save(**bundle)
+
+            # Step 1: Generate story and title
+            if checkpoint.get("story"):
+                title, description, story = checkpoint.get("title"), checkpoint.get("description"), checkpoint.get("story")
+            else:
+                title, description, story = await self.story_generator.generate_story_and_title(story_type, language, duration)
+                if not title or not story:
+                    raise ValueError("Failed to generate story and title")
+                checkpoint.save(title=title, description=description, story=story)
             completed_steps += 1
-            await task.update(task_id=task_id, progress=round(completed_steps/total_steps, 1))
+            await self._complete_step(task_id, "story", completed_steps, total_steps)
 
-            # Step 2: Create resource directory and generate characters
+            # Step 2: Create resource directory and generate characters. With
+            # storyboard.concurrent_characters this overlaps with step 3 and each
+            # scene only waits for it right before generating its image
             story_dir = create_resource_dir(settings.STORY_DIR, story_type, title)
-            characters = await self.story_generator.generate_characters(story) if story_type not in ['life pro tips', 'fun facts'] else []
-            completed_steps += 1
-            await task.update(task_id=task_id, progress=round(completed_steps/total_steps, 1))
+            characters = checkpoint.get("characters")
+            characters_task: Optional[asyncio.Task] = None
+            if characters is None and story_type in STORY_TYPES_WITHOUT_CHARACTERS:
+                characters = []
+                checkpoint.save(characters=characters)
+            elif characters is None and self.concurrent_characters and checkpoint.get("storyboard") is None:
+                async def finish_characters() -> List[Dict[str, Any]]:
+                    nonlocal characters, completed_steps
+                    characters = await self.story_generator.generate_characters(story)
+                    checkpoint.save(characters=characters)
+                    completed_steps += 1
+                    await self._complete_step(task_id, "characters", completed_steps, total_steps)
+                    return characters
 
-            # Step 3: Generate storyboard
-            storyboard_project = await self.story_generator.generate_storyboard(story_type, title, story, [c["name"] for c in characters])
-            if not storyboard_project.get("storyboards"):
-                raise ValueError("Failed to generate storyboard")
-            storyboard_project["characters"] = characters
-            completed_steps += 1
-            await task.update(task_id=task_id, progress=round(completed_steps/total_steps, 1))
+                characters_task = asyncio.create_task(finish_characters())
+            elif characters is None:
+                characters = await self.story_generator.generate_characters(story)
+                checkpoint.save(characters=characters)
+
+            if characters_task is None:
+                completed_steps += 1
+                await self._complete_step(task_id, "characters", completed_steps, total_steps)
+
+            async def get_characters() -> List[Dict[str, Any]]:
+                return await characters_task if characters_task is not None else characters
+
+            # Per-scene pipelines (step 4). When the storyboard is streamed they
+            # start during step 3, as soon as each scene has been generated
+            scene_stage = 3
+            scene_tasks: List[asyncio.Task] = []
+            scene_progress: List[float] = []
+            last_render_event = -self.render_event_step
+
+            async def report_scene_progress(index: int, fraction: float):
+                nonlocal last_render_event
+                scene_progress[index] = fraction
+                percent = int(100 * sum(scene_progress) / len(scene_progress))
+                progress = round((scene_stage + percent / 100) / total_steps, 2)
+                self.task_state.report_progress(task_id, progress)
+                if percent - last_render_event >= self.render_event_step or percent >= 100:
+                    last_render_event = percent
+                    await self.progress_broker.publish(task_id, "render", percent=percent, progress=progress)
+
+            def start_scene(scene: Dict[str, Any], total: Optional[int]):
+                scene_progress.append(0.0)
+                scene_tasks.append(asyncio.create_task(self._process_scene(
+                    task_id, len(scene_tasks), scene, total, get_characters, art_style, story_dir, voice_name, checkpoint, report_scene_progress
+                )))
 
-            # Step 4: Generate images
-            image_urls = await self.image_generator.generate_images(task_id, storyboard_project, art_style)
-            if not image_urls:
-                raise ValueError("Failed to generate images")
+            try:
+                # Step 3: Generate storyboard
+                storyboard_project = checkpoint.get("storyboard")
+                if storyboard_project is None:
+                    # Scene files recorded for an earlier storyboard don't belong to a new one
+                    checkpoint.data.pop("scenes", None)
+                    character_names = [c["name"] for c in characters] if characters_task is None else None
+                    if self.stream_storyboard:
+                        storyboard_stream = self.story_generator.stream_storyboard(story_type, title, story, character_names)
+                        async for scene in storyboard_stream:
+                            start_scene(scene, None)
+                        storyboard_project = storyboard_stream.project
+                    else:
+                        storyboard_project = await self.story_generator.generate_storyboard(story_type, title, story, character_names)
+                    if not storyboard_project.get("storyboards"):
+                        raise ValueError("Failed to generate storyboard")
+                    # Narration for the remaining scenes doesn't have to wait for the characters either
+                    scenes = storyboard_project["storyboards"]
+                    for scene in scenes[len(scene_tasks):]:
+                        start_scene(scene, len(scenes))
+                    storyboard_project["characters"] = await get_characters()
+                    # Scenes record their image results on this same dict, so later saves persist them
+                    checkpoint.save(storyboard=storyboard_project)
+                completed_steps += 1
+                await self._complete_step(task_id, "storyboard", completed_steps, total_steps)
+
+                # Step 4: Run each scene through TTS, image generation, download and
+                # segment render as soon as its own inputs are ready
+                scenes = storyboard_project["storyboards"]
+                for scene in scenes[len(scene_tasks):]:
+                    start_scene(scene, len(scenes))
+                render_scenes = [render_scene for render_scene in await asyncio.gather(*scene_tasks) if render_scene]
+            except BaseException:
+                if characters_task is not None:
+                    characters_task.cancel()
+                for scene_task in scene_tasks:
+                    scene_task.cancel()
+                raise
             completed_steps += 1
-            await task.update(task_id=task_id, progress=round(completed_steps/total_steps, 1))
-
-            # Step 5: Save images to database
-            image_create_tasks = []
-            for i, image_url in enumerate(image_urls):
-                image_data = {
-                    "id": str(uuid4()),
-                    "task_id": task_id,
-                    "urls": [image_url] if image_url else [],
-                    "subtitles": storyboard_project["storyboards"][i]["description"],
-                    "status": "completed" if image_url else "failed",
-                    "enhanced_prompt": storyboard_project["storyboards"][i].get("enhanced_prompt", ""),
-                    "error_message": storyboard_project["storyboards"][i].get("error_message", "")
-                }
-                image_create_tasks.append(Image.create(**image_data))
-            await asyncio.gather(*image_create_tasks)
+            await self._complete_step(task_id, "scenes", completed_steps, total_steps)
+
+            # Step 5: Save images to database (once, even if the task is resumed later)
+            if not checkpoint.get("images_saved"):
+                image_rows = []
+                for i, scene in enumerate(scenes):
+                    image_url = scene.get("image")
+                    image_rows.append({
+                        "id": str(uuid4()),
+                        "task_id": task_id,
+                        "scene_number": i + 1,
+                        "urls": [image_url] if image_url else [],
+                        "subtitles": scene["description"],
+                        "status": "completed" if image_url else "failed",
+                        "enhanced_prompt": scene.get("enhanced_prompt", ""),
+                        "error_message": scene.get("error_message", "")
+                    })
+                if not await Image.bulk_create(image_rows):
+                    raise ValueError("Failed to save images to database")
+                await checkpoint.persist(images_saved=True)
             completed_steps += 1
-            await task.update(task_id=task_id, progress=round(completed_steps/total_steps, 1))
+            await self._complete_step(task_id, "save_images", completed_steps, total_steps)
+
+            # Step 6: Join the scene segments (or render them in one pass) and upload the video
+            if self.video_generator.parallel_scenes:
+                video_path = await self.video_generator.join_scenes([render_scene["segment_path"] for render_scene in render_scenes], story_dir)
+            else:
+                async def report_render_progress(percent: int):
+                    nonlocal last_render_event
+                    progress = round((completed_steps + percent / 100) / total_steps, 2)
+                    self.task_state.report_progress(task_id, progress)
+                    if percent - last_render_event >= self.render_event_step or percent >= 100:
+                        last_render_event = percent
+                        await self.progress_broker.publish(task_id, "render", percent=percent, progress=progress)
 
-            # Step 6: Generate and upload video
-            video_path = await self.video_generator.generate_video(storyboard_project, story_dir, voice_name)
+                last_render_event = -self.render_event_step
+                video_path = await self.video_generator.render_video(render_scenes, story_dir, progress_callback=report_render_progress)
             if not video_path:
                 raise ValueError("Failed to create video")
 
@@ -104,22 +276,24 @@ class VideoTaskProcessor:
                 raise ValueError("Failed to upload video to R2")
 
             # Update the video_task table instead of creating a new video record
+            completed_steps += 1
             update_data = {
                 "url": r2_url,
                 "story_title": title,
                 "story_description": description,
                 "story_text": story,
-                "status": "completed"
+                "status": "completed",
+                "progress": round(completed_steps/total_steps, 1),
+                "checkpoint": None
             }
-            updated_task = await task.update(task_id=task_id, **update_data)
-            if not updated_task:
+            updated = await self.task_state.update(task_id, **update_data)
+            if not updated:
                 raise ValueError("Failed to update video task record in database")
-
-            completed_steps += 1
-            await task.update(task_id=task_id, status="completed", progress=round(completed_steps/total_steps, 1))
+            await self.progress_broker.publish(task_id, "status", status="completed", progress=update_data["progress"], url=r2_url)
         except Exception as e:
             logger.error(f"Error in video generation task: {str(e)}")
-            await task.update(task_id=task_id, status="failed", error_message=str(e))
+            await self.task_state.update(task_id, status="failed", error_message=str(e))
+            await self.progress_broker.publish(task_id, "status", status="failed", error_message=str(e))
         finally:
             pass
             # TODO: Cleanup temporary files
@@ -0,0 +1,151 @@
+import numpy as np
+from typing import List, Tuple
+from PIL import Image, ImageDraw, ImageFont, ImageFilter
+
+# (word, start, end) in seconds, relative to the start of the clip
+WordTiming = Tuple[str, float, float]
+
+
+def estimate_word_timings(text: str, duration: float) -> List[WordTiming]:
+    """
+    Spread the words of a subtitle over the clip duration, weighted by word length.
+    """
+    words = text.split()
+    if not words or duration <= 0:
+        return []
+
+    weights = np.array([len(word) + 1 for word in words], dtype=np.float64)
+    ends = np.cumsum(weights) / weights.sum() * duration
+    starts = np.concatenate(([0.0], ends[:-1]))
+    return [(word, float(start), float(end)) for word, start, end in zip(words, starts, ends)]
+
+
+class CaptionRenderer:
+    """
+    Burns word-timed captions into a clip during the main render.
+
+    Every (line, highlighted word) state is rasterised once up front, so a frame
+    only costs one alpha blend of a small strip at the caption position.
+    """
+
+    def __init__(
+        self,
+        font_path: str,
+        font_size: int = 70,
+        font_color: str = "white",
+        stroke_width: int = 3,
+        stroke_color: str = "black",
+        shadow_strength: float = 1.0,
+        shadow_blur: float = 0.1,
+        highlight_current_word: bool = True,
+        word_highlight_color: str = "yellow",
+        line_count: int = 1,
+        padding: int = 70,
+        position: str = "bottom",
+    ):
+        self.font = ImageFont.truetype(font_path, font_size)
+        self.font_size = font_size
+        self.font_color = font_color
+        self.stroke_width = stroke_width
+        self.stroke_color = stroke_color
+        self.shadow_strength = shadow_strength
+        self.shadow_blur = shadow_blur
+        self.highlight_current_word = highlight_current_word
+        self.word_highlight_color = word_highlight_color
+        self.line_count = line_count
+        self.padding = padding
+        self.position = position
+        self.space_width = self.font.getlength(" ")
+        self.line_height = font_size + 2 * stroke_width
+
+    def _split_lines(self, words: List[WordTiming], max_width: float) -> List[List[int]]:
+        # Greedily fill each line up to max_width
+        lines, current, current_width = [], [], 0.0
+        for i, (word, _, _) in enumerate(words):
+            word_width = self.font.getlength(word)
+            needed = word_width if not current else current_width + self.space_width + word_width
+            if current and needed > max_width:
+                lines.append(current)
+                current, current_width = [i], word_width
+            else:
+                current.append(i)
+                current_width = needed
+        if current:
+            lines.append(current)
+        return lines
+
+    def _group_pages(self, words: List[WordTiming], max_width: float) -> List[List[int]]:
+        # Each caption page shows line_count lines at a time
+        lines = self._split_lines(words, max_width)
+        return [
+            [i for line in lines[start:start + self.line_count] for i in line]
+            for start in range(0, len(lines), self.line_count)
+        ]
+
+    def _render_page(self, words: List[WordTiming], page: List[int], highlight: int, width: int, max_width: float) -> np.ndarray:
+        margin = self.stroke_width + int(self.font_size * self.shadow_blur) + 2
+        height = self.line_height * self.line_count + 2 * margin
+        text_layer = Image.new("RGBA", (width, height), (0, 0, 0, 0))
+        draw = ImageDraw.Draw(text_layer)
+
+        # Lay the page out line by line, centred horizontally
+        rows = self._split_lines([words[i] for i in page], max_width)
+        y = margin
+        for row in rows:
+            row_words = [page[i] for i in row]
+            row_width = sum(self.font.getlength(words[i][0]) for i in row_words) + self.space_width * (len(row_words) - 1)
+            x = (width - row_width) / 2
+            for i in row_words:
+                word = words[i][0]
+                color = self.word_highlight_color if self.highlight_current_word and i == highlight else self.font_color
+                draw.text((x, y), word, font=self.font, fill=color, stroke_width=self.stroke_width, stroke_fill=self.stroke_color)
+                x += self.font.getlength(word) + self.space_width
+            y += self.line_height
+
+        if self.shadow_strength > 0:
+            alpha = text_layer.getchannel("A").point(lambda a: int(a * min(self.shadow_strength, 1.0)))
+            shadow = Image.new("RGBA", text_layer.size, (0, 0, 0, 0))
+            shadow.putalpha(alpha.filter(ImageFilter.GaussianBlur(max(1, self.font_size * self.shadow_blur))))
+            text_layer = Image.alpha_composite(shadow, text_layer)
+
+        return np.asarray(text_layer)
+
+    def apply(self, clip, word_timings: List[WordTiming]):
+        """
+        Return the clip with the captions composited onto every frame.
+        """
+        if not word_timings:
+            return clip
+
+        width, height = clip.size
+        max_width = width - 2 * self.padding
+        pages = self._group_pages(word_timings, max_width)
+        page_of_word = {i: page for page in pages for i in page}
+
+        overlays = []
+        for i in range(len(word_timings)):
+            rgba = self._render_page(word_timings, page_of_word[i], i, width, max_width)
+            alpha = rgba[:, :, 3:4].astype(np.float32) / 255.0
+            overlays.append((rgba[:, :, :3].astype(np.float32) * alpha, 1.0 - alpha))
+
+        strip_height = overlays[0][0].shape[0]
+        if self.position == "top":
+            y0 = self.padding
+        elif self.position == "center":
+            y0 = (height - strip_height) // 2
+        else:
+            y0 = height - self.padding - strip_height
+        y0 = max(0, min(y0, height - strip_height))
+        y1 = y0 + strip_height
+        starts = np.array([start for _, start, _ in word_timings])
+
+        def burn(get_frame, t):
+            frame = get_frame(t)
+            index = max(0, int(np.searchsorted(starts, t, side="right")) - 1)
+            premultiplied, inverse_alpha = overlays[index]
+            # Frames may be shared buffers (still images, the Ken Burns renderer), so never blend in place
+            out = frame.copy()
+            out[y0:y1] = (frame[y0:y1] * inverse_alpha + premultiplied).astype(np.uint8)
+            return out
+
+        return clip.fl(burn)
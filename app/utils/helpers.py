@@ -1,10 +1,11 @@
 import os
 import re
 from datetime import datetime
-from typing import Dict, Any, Tuple
+from typing import Dict, Any, Tuple, AsyncIterator, Optional
 from PIL import Image
 from app.core.logging import logger
 from app.core.config import settings
+from app.services.rate_limiter import get_limiter
 
 
 def create_resource_dir(base_dir: str, story_type: str, title: str) -> str:
@@ -21,18 +22,50 @@ def create_resource_dir(base_dir: str, story_type: str, title: str) -> str:
 
     return story_dir
 
-async def call_openai_api(client, messages):
+def get_openai_model(stage: Optional[str] = None) -> str:
+    """
+    Chat model (or Azure deployment) for a pipeline stage: openai.stage_models
+    can route individual stages, e.g. "characters", to a cheaper model.
+    """
+    stage_models = settings.openai.get('stage_models') or {}
+    return stage_models.get(stage) or settings.openai.get('model')
+
+async def call_openai_api(client, messages, stage: Optional[str] = None, **kwargs):
     try:
-        response = await client.chat.completions.create(
-            model=settings.openai.get('model'),
+        model = get_openai_model(stage)
+        response = await get_limiter("openai", model).call(
+            client.chat.completions.create,
+            model=model,
             temperature=settings.openai.get('temperature'),
-            messages=messages
+            messages=messages,
+            **kwargs
         )
         return response.choices[0].message.content
     except Exception as e:
         logger.error(f"Error calling OpenAI API: {e}")
         return None
 
+async def stream_openai_api(client, messages, stage: Optional[str] = None, **kwargs) -> AsyncIterator[str]:
+    """
+    Like call_openai_api, but yields the completion text as it is generated.
+    Opening the stream goes through the rate limiter; an error mid-stream ends it early.
+    """
+    try:
+        model = get_openai_model(stage)
+        stream = await get_limiter("openai", model).call(
+            client.chat.completions.create,
+            model=model,
+            temperature=settings.openai.get('temperature'),
+            messages=messages,
+            stream=True,
+            **kwargs
+        )
+        async for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+    except Exception as e:
+        logger.error(f"Error streaming from OpenAI API: {e}")
+
 def create_empty_storyboard(title: str) -> Dict[str, Any]:
     return {
         "project_info": {
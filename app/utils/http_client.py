@@ -0,0 +1,43 @@
+import asyncio
+import aiohttp
+from typing import Dict, Optional
+from app.core.config import settings
+
+# One pooled session per event loop; aiohttp sessions can't be shared across loops
+_sessions: Dict[asyncio.AbstractEventLoop, aiohttp.ClientSession] = {}
+
+
+def http_config() -> dict:
+    return settings.http or {}
+
+
+async def get_http_session() -> aiohttp.ClientSession:
+    """
+    Return the process-wide HTTP session for the running loop, creating it on first use.
+
+    Connections are kept alive and reused per host, and DNS lookups are cached.
+    """
+    loop = asyncio.get_running_loop()
+    session = _sessions.get(loop)
+    if session is None or session.closed:
+        config = http_config()
+        connector = aiohttp.TCPConnector(
+            limit=config.get('limit', 100),
+            limit_per_host=config.get('limit_per_host', 16),
+            keepalive_timeout=config.get('keepalive_timeout', 30),
+            ttl_dns_cache=config.get('dns_cache_ttl', 300),
+        )
+        timeout = aiohttp.ClientTimeout(
+            total=config.get('timeout', 60),
+            connect=config.get('connect_timeout', 10),
+        )
+        session = aiohttp.ClientSession(connector=connector, timeout=timeout)
+        _sessions[loop] = session
+    return session
+
+
+async def close_http_session() -> None:
+    loop = asyncio.get_running_loop()
+    session: Optional[aiohttp.ClientSession] = _sessions.pop(loop, None)
+    if session is not None and not session.closed:
+        await session.close()
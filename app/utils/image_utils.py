@@ -1,42 +1,70 @@
 import os
+import asyncio
+import random
+import tempfile
 import aiohttp
+from typing import Optional
 from app.core.logging import logger
+from app.utils.http_client import get_http_session, http_config
 
 
- # async def download_image(self, url, output_path):
-    #     async with aiohttp.ClientSession() as session:
-    #         async with session.get(url) as response:
-    #             if response.status == 200:
-    #                 with open(output_path, 'wb') as f:
-    #                     f.write(await response.read())
-    #                 return output_path
-    #             else:
-    #                 logger.error(f"Failed to download image: {url}")
-    #                 return None
+class RetryableDownloadError(Exception):
+    pass
 
-async def download_image(image_url: str, save_path: str) -> bool:
+
+async def _stream_to_file(image_url: str, save_path: str, chunk_size: int) -> None:
+    session = await get_http_session()
+    async with session.get(image_url) as response:
+        if response.status == 429 or response.status >= 500:
+            raise RetryableDownloadError(f"Status code: {response.status}")
+        if response.status != 200:
+            raise ValueError(f"Status code: {response.status}")
+
+        # Stream into a temp file next to the target and rename it into place when complete
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(save_path) or ".", suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    await asyncio.to_thread(f.write, chunk)
+            os.replace(temp_path, save_path)
+        except BaseException:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            raise
+
+
+async def download_image(image_url: str, save_path: str) -> Optional[str]:
     """
     Download an image from the given URL and save it to the specified path.
-    
+
+    The body is streamed to disk through the shared pooled HTTP session.
+    Timeouts, connection errors, 429 and 5xx responses are retried with
+    exponential backoff.
+
     Args:
     image_url (str): The URL of the image to download.
     save_path (str): The full path where the image should be saved.
-    
+
     Returns:
-    bool: True if the image was successfully downloaded and saved, False otherwise.
+    Optional[str]: save_path if the image was successfully downloaded and saved, None otherwise.
     """
-    try:
-        async with aiohttp.ClientSession() as session:
-            async with session.get(image_url) as response:
-                if response.status == 200:
-                    image_data = await response.read()
-                    with open(save_path, "wb") as f:
-                        f.write(image_data)
-                    return save_path
-                else:
-                    logger.error(f"Failed to download image from {image_url}. Status code: {response.status}")
-                    return None
-    except Exception as e:
-
-        logger.error(f"Error downloading image from {image_url}: {str(e)}")
-        return None
\ No newline at end of file
+    config = http_config()
+    max_retries = config.get('max_retries', 3)
+    backoff_base = config.get('backoff_base', 0.5)
+    chunk_size = config.get('chunk_size', 64 * 1024)
+
+    for attempt in range(max_retries):
+        try:
+            await _stream_to_file(image_url, save_path, chunk_size)
+            return save_path
+        except (RetryableDownloadError, aiohttp.ClientError, asyncio.TimeoutError) as e:
+            if attempt < max_retries - 1:
+                delay = backoff_base * (2 ** attempt) * (1 + random.random())
+                logger.warning(f"Error downloading image from {image_url} (attempt {attempt + 1}/{max_retries}): {str(e) or type(e).__name__}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+            else:
+                logger.error(f"Failed to download image from {image_url} after {max_retries} attempts: {str(e) or type(e).__name__}")
+        except Exception as e:
+            logger.error(f"Error downloading image from {image_url}: {str(e)}")
+            return None
+    return None
@@ -0,0 +1,111 @@
+import json
+from typing import Any, Dict, List, Optional
+from app.core.logging import logger
+
+
+class JsonArrayItemParser:
+    """
+    Incremental parser that pulls complete objects out of one array of a
+    streamed JSON document.
+
+    Text is fed as it arrives; feed() returns every element of the top-level
+    `key` array (e.g. "storyboards") whose closing brace has been seen so far.
+    Anything before the first "{" (such as a ```json fence) is ignored, and
+    `key` only matches an object key at the top level, never a string value.
+    Each chunk is scanned once; the whole document is available as `text`
+    for a final full parse.
+    """
+
+    def __init__(self, key: str):
+        self.key = key
+        self._chunks: List[str] = []
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escaped = False
+        # Top-level string being read, the last one closed, and the key whose value comes next
+        self._string_parts: Optional[List[str]] = None
+        self._last_string: Optional[str] = None
+        self._value_key: Optional[str] = None
+        self._array_depth: Optional[int] = None
+        self._item_parts: Optional[List[str]] = None
+        self._array_closed = False
+
+    @property
+    def text(self) -> str:
+        if len(self._chunks) > 1:
+            self._chunks = ["".join(self._chunks)]
+        return self._chunks[0] if self._chunks else ""
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        self._chunks.append(chunk)
+        items = []
+        pos = 0
+        if not self._started:
+            pos = chunk.find("{")
+            if pos == -1:
+                return items
+            self._started = True
+
+        # Start of the current item (or top-level string) within this chunk
+        item_from = 0 if self._item_parts is not None else None
+        string_from = 0 if self._string_parts is not None else None
+        for pos in range(pos, len(chunk)):
+            char = chunk[pos]
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                    if self._string_parts is not None:
+                        self._string_parts.append(chunk[string_from:pos])
+                        self._last_string = "".join(self._string_parts)
+                        self._string_parts = string_from = None
+                continue
+
+            if char == '"':
+                self._in_string = True
+                if self._depth == 1:
+                    self._string_parts, string_from = [], pos + 1
+            elif self._depth == 1 and char == ":":
+                self._value_key = self._last_string
+            elif self._depth == 1 and char == ",":
+                self._value_key = self._last_string = None
+            elif char in "{[":
+                if (
+                    char == "[" and self._depth == 1 and self._array_depth is None
+                    and not self._array_closed and self._value_key == self.key
+                ):
+                    self._array_depth = self._depth + 1
+                elif char == "{" and self._array_depth is not None and self._depth == self._array_depth:
+                    self._item_parts, item_from = [], pos
+                self._depth += 1
+            elif char in "}]":
+                self._depth -= 1
+                if self._array_depth is not None:
+                    if char == "}" and self._depth == self._array_depth and self._item_parts is not None:
+                        self._item_parts.append(chunk[item_from:pos + 1])
+                        item = self._parse_item("".join(self._item_parts))
+                        if item is not None:
+                            items.append(item)
+                        self._item_parts = item_from = None
+                    elif char == "]" and self._depth == self._array_depth - 1:
+                        self._array_depth = None
+                        self._array_closed = True
+
+        # Carry unfinished items and keys over to the next chunk
+        if self._item_parts is not None:
+            self._item_parts.append(chunk[item_from:])
+        if self._string_parts is not None:
+            self._string_parts.append(chunk[string_from:])
+        return items
+
+    def _parse_item(self, item_text: str) -> Optional[Dict[str, Any]]:
+        try:
+            item = json.loads(item_text)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse streamed {self.key} item: {e}")
+            return None
+        return item if isinstance(item, dict) else None
@@ -1,7 +1,7 @@
 from moviepy.editor import *
 import numpy as np
 from PIL import Image
-import cv2
+from app.utils.ken_burns import ken_burns_clip
 
 def fade(clip, duration=1, type="both"):
     if type == "in":
@@ -40,41 +40,14 @@ def shake(clip, effect_duration=1, max_offset=5):
     return clip.fl(shake_effect)
 
 
-def zoom(clip, mode="in", position="center", speed=3):
-    if hasattr(clip, "fps") and clip.fps is not None:
-        fps = clip.fps
-    else:
-        fps = 1
-
-    duration = clip.duration
-    total_frames = max(1, int(duration * fps))  # ensure at least 1 frame
-
-    def main(getframe, t):
-        frame = getframe(t)
-        h, w = frame.shape[:2]
-        i = t * fps
-        if mode == "out":
-            i = total_frames - i
-        zoom = 1 + (i * ((0.1 * speed) / total_frames))
-        
-        # compute the extra zoom to avoid black bars
-        extra_zoom = max(w / (w - 2), h / (h - 2))
-        zoom *= extra_zoom
-
-        positions = {
-            "center": [(w - (w / zoom)) / 2, (h - (h / zoom)) / 2],
-            "left": [0, (h - (h / zoom)) / 2],
-            "right": [w - (w / zoom), (h - (h / zoom)) / 2],
-            "top": [(w - (w / zoom)) / 2, 0],
-            "topleft": [0, 0],
-            "topright": [w - (w / zoom), 0],
-            "bottom": [(w - (w / zoom)) / 2, h - (h / zoom)],
-            "bottomleft": [0, h - (h / zoom)],
-            "bottomright": [w - (w / zoom), h - (h / zoom)],
-        }
-        tx, ty = positions[position]
-        M = np.array([[zoom, 0, -tx * zoom], [0, zoom, -ty * zoom]])
-        frame = cv2.warpAffine(frame, M, (w, h))
-        return frame
+def zoom(clip, mode="in", position="center", speed=3, fps=24):
+    """
+    Apply a zoom-in/zoom-out to a still-image clip.
 
-    return clip.fl(main)
\ No newline at end of file
+    The clip is read once and handed to the Ken Burns renderer, which
+    precomputes the crop schedule for the whole scene. The clip's audio is kept.
+    """
+    zoomed = ken_burns_clip(clip.get_frame(0), clip.duration, mode=mode, position=position, speed=speed, fps=fps)
+    if clip.audio is not None:
+        zoomed = zoomed.set_audio(clip.audio)
+    return zoomed
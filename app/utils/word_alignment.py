@@ -0,0 +1,136 @@
+import re
+import numpy as np
+from typing import Callable, List, Tuple
+from app.utils.captions import WordTiming, estimate_word_timings
+
+ALIGN_SAMPLE_RATE = 16000
+HOP_SECONDS = 0.01
+MIN_PAUSE_SECONDS = 0.12
+SILENCE_DB = -35.0
+# Frames below this RMS (about -80 dBFS) are silent however quiet the whole clip is
+SILENCE_FLOOR_RMS = 1e-4
+
+# (start, end) in seconds of a stretch of speech
+SpeechSegment = Tuple[float, float]
+# Finds the speech segments in mono samples at a sample rate; detect_speech_segments
+# by default, or a stand-in (e.g. fixed segments) in tests
+SpeechDetector = Callable[[np.ndarray, int], List[SpeechSegment]]
+
+_BREAK_PUNCTUATION = re.compile(r"[.,;:!?…。，！？]['\"”’)]*$")
+
+
+def to_mono(samples: np.ndarray) -> np.ndarray:
+    samples = np.asarray(samples, dtype=np.float32)
+    return samples.mean(axis=1) if samples.ndim == 2 else samples
+
+
+def detect_speech_segments(samples: np.ndarray, sample_rate: int, silence_db: float = SILENCE_DB, min_pause: float = MIN_PAUSE_SECONDS) -> List[SpeechSegment]:
+    """
+    Find stretches of speech in a mono PCM signal from short-time energy.
+
+    Frames quieter than silence_db relative to the loudest frame count as silence;
+    silent runs shorter than min_pause are treated as part of the surrounding speech.
+    """
+    hop = max(1, int(sample_rate * HOP_SECONDS))
+    n_frames = len(samples) // hop
+    if n_frames == 0:
+        return []
+
+    frames = samples[:n_frames * hop].reshape(n_frames, hop)
+    rms = np.sqrt(np.mean(frames ** 2, axis=1)) + 1e-10
+    db = 20 * np.log10(rms / rms.max())
+    voiced = (db > silence_db) & (rms > SILENCE_FLOOR_RMS)
+    if not voiced.any():
+        return []
+
+    # Edges of voiced runs: +1 where speech starts, -1 where it stops
+    edges = np.diff(np.concatenate(([0], voiced.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+
+    min_gap = int(round(min_pause / HOP_SECONDS))
+    segments = [[starts[0], ends[0]]]
+    for start, end in zip(starts[1:], ends[1:]):
+        if start - segments[-1][1] < min_gap:
+            segments[-1][1] = end
+        else:
+            segments.append([start, end])
+
+    return [(float(start * HOP_SECONDS), float(end * HOP_SECONDS)) for start, end in segments]
+
+
+def align_words(
+    text: str,
+    samples: np.ndarray,
+    sample_rate: int,
+    detect_speech: SpeechDetector = detect_speech_segments,
+) -> List[WordTiming]:
+    """
+    Derive per-word timestamps for text that is known to be spoken in the audio.
+
+    Words are spread over the detected speech by length, then the word boundary
+    closest to each pause is snapped onto it (preferring boundaries after
+    punctuation), so no word straddles a pause.
+    """
+    words = text.split()
+    samples = to_mono(samples)
+    duration = len(samples) / sample_rate if sample_rate else 0.0
+    segments = detect_speech(samples, sample_rate) if words else []
+    if not segments:
+        return estimate_word_timings(text, duration)
+
+    seg_starts = np.array([start for start, _ in segments])
+    seg_lengths = np.array([end - start for start, end in segments])
+    # Speech-time position at which each segment ends (pauses removed)
+    seg_offsets = np.cumsum(seg_lengths)
+    speech_total = seg_offsets[-1]
+
+    weights = np.array([len(word) + 1 for word in words], dtype=np.float64)
+    boundaries = np.cumsum(weights) / weights.sum() * speech_total
+
+    # Snap one word boundary to every pause, in order, so later pauses can't steal earlier words
+    anchors = {len(words) - 1: len(segments) - 1}
+    first_free = 0
+    for k in range(len(segments) - 1):
+        candidates = np.arange(first_free, len(words) - 1)
+        if len(candidates) == 0:
+            break
+        distance = np.abs(boundaries[candidates] - seg_offsets[k])
+        # A boundary after punctuation is a much more likely pause location
+        is_break = np.array([bool(_BREAK_PUNCTUATION.search(words[j])) for j in candidates])
+        distance[is_break] *= 0.5
+        best = int(candidates[np.argmin(distance)])
+        anchors[best] = k
+        first_free = best + 1
+
+    # Within each anchored run of words, share the segment(s) proportionally by weight
+    timings = []
+    run_start_word, run_start_seg = 0, 0
+    for last_word in sorted(anchors):
+        last_seg = anchors[last_word]
+        run_words = range(run_start_word, last_word + 1)
+        run_weights = weights[run_start_word:last_word + 1]
+        span_start = seg_offsets[run_start_seg - 1] if run_start_seg > 0 else 0.0
+        span = seg_offsets[last_seg] - span_start
+        run_ends = span_start + np.cumsum(run_weights) / run_weights.sum() * span
+        run_begins = np.concatenate(([span_start], run_ends[:-1]))
+        for j, begin, end in zip(run_words, run_begins, run_ends):
+            timings.append((words[j], begin, end))
+        run_start_word, run_start_seg = last_word + 1, last_seg + 1
+
+    def to_wall_clock(position: float, is_end: bool) -> float:
+        # Map a speech-time position back onto the audio timeline, skipping pauses
+        side = "left" if is_end else "right"
+        k = min(int(np.searchsorted(seg_offsets, position, side=side)), len(segments) - 1)
+        previous = seg_offsets[k - 1] if k > 0 else 0.0
+        return float(seg_starts[k] + (position - previous))
+
+    return [(word, to_wall_clock(begin, False), to_wall_clock(end, True)) for word, begin, end in timings]
+
+
+def align_audio_clip(text: str, audio_clip, detect_speech: SpeechDetector = detect_speech_segments) -> List[WordTiming]:
+    """
+    Align subtitle text against an already opened moviepy AudioFileClip.
+    """
+    samples = audio_clip.to_soundarray(fps=ALIGN_SAMPLE_RATE)
+    return align_words(text, samples, ALIGN_SAMPLE_RATE, detect_speech=detect_speech)
@@ -0,0 +1,134 @@
+import asyncio
+import signal
+from app.core.config import settings
+from app.core.logging import logger
+from app.models.video_task import VideoTask
+from app.services.task_queue import TaskQueue
+from app.services.task_state import task_state
+from app.services.video_task_processor import VideoTaskProcessor
+from app.utils.http_client import close_http_session
+from app.db.session import query_metrics
+from app.prompts.registry import prompt_registry
+
+
+class Worker:
+    """
+    Render worker: claims queued video tasks from the database and processes
+    up to `worker.concurrency` of them at a time.
+
+    Run one or more of these next to the API:
+        python -m app.worker
+    """
+
+    def __init__(self):
+        worker_config = settings.worker or {}
+        self.concurrency = worker_config.get('concurrency', 2)
+        self.poll_interval = worker_config.get('poll_interval', 2)
+        self.heartbeat_interval = worker_config.get('heartbeat_interval', 15)
+        self.queue = TaskQueue()
+        self.processor = VideoTaskProcessor()
+        self.active: set[asyncio.Task] = set()
+        self.stopping = asyncio.Event()
+
+    async def _heartbeat(self, task_id: str, lease_lost: asyncio.Event, runner: asyncio.Task):
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            try:
+                if not await self.queue.heartbeat(task_id):
+                    # The task was recovered and may already run elsewhere; stop working on it
+                    logger.warning(f"Lost lease on VideoTask {task_id}, abandoning it")
+                    lease_lost.set()
+                    runner.cancel()
+                    return
+            except Exception as e:
+                logger.error(f"Heartbeat failed for VideoTask {task_id}: {str(e)}")
+
+    async def _run_task(self, task: VideoTask):
+        lease_lost = asyncio.Event()
+        heartbeat = asyncio.create_task(self._heartbeat(task.id, lease_lost, asyncio.current_task()))
+        try:
+            await self.processor.process_video_generation_task(
+                task.id,
+                task.story_topic,
+                task.art_style,
+                task.duration,
+                task.language,
+                task.voice_name,
+                checkpoint_data=task.checkpoint
+            )
+        except asyncio.CancelledError:
+            if not lease_lost.is_set():
+                raise
+        except Exception as e:
+            logger.error(f"Unhandled error processing VideoTask {task.id}: {str(e)}")
+        finally:
+            heartbeat.cancel()
+            if lease_lost.is_set():
+                # A stale checkpoint must not overwrite the new owner's
+                task_state.discard(task.id)
+            else:
+                try:
+                    await task_state.flush(task.id)
+                except Exception as e:
+                    logger.error(f"Error flushing state for VideoTask {task.id}: {str(e)}")
+                await self.queue.release(task.id)
+
+    async def run(self):
+        logger.info(f"Worker {self.queue.worker_id} started with concurrency {self.concurrency}")
+        story_pool = self.processor.story_pool
+        pool_refill = asyncio.create_task(story_pool.run(self.stopping)) if story_pool.enabled else None
+        last_recovery = 0.0
+        loop = asyncio.get_running_loop()
+
+        while not self.stopping.is_set():
+            # Any worker may requeue tasks whose owner stopped heartbeating
+            if loop.time() - last_recovery >= self.heartbeat_interval:
+                last_recovery = loop.time()
+                try:
+                    await self.queue.recover_abandoned()
+                except Exception as e:
+                    logger.error(f"Error recovering abandoned tasks: {str(e)}")
+
+            if len(self.active) < self.concurrency:
+                task = await self.queue.claim()
+                if task is not None:
+                    runner = asyncio.create_task(self._run_task(task))
+                    self.active.add(runner)
+                    runner.add_done_callback(self.active.discard)
+                    continue
+
+            try:
+                await asyncio.wait_for(self.stopping.wait(), timeout=self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+        if self.active:
+            logger.info(f"Worker {self.queue.worker_id} waiting for {len(self.active)} task(s) to finish")
+            await asyncio.gather(*self.active, return_exceptions=True)
+        if pool_refill is not None:
+            pool_refill.cancel()
+            await asyncio.gather(pool_refill, return_exceptions=True)
+        await task_state.flush_all()
+        self.processor.video_generator.render_executor.shutdown()
+        await close_http_session()
+        logger.info(f"Worker {self.queue.worker_id} stopped, database query stats: {query_metrics.snapshot()}")
+        tts_cache = self.processor.video_generator.audio_generator.cache
+        if tts_cache is not None:
+            logger.info(f"TTS cache stats: {tts_cache.stats()}")
+
+    def stop(self):
+        self.stopping.set()
+
+
+async def main():
+    worker = Worker()
+    # Importing the processor registered the prompt templates; build them before the first task
+    prompt_registry.compile_all()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, worker.stop)
+    await worker.run()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,41 @@
+import os
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
+import pytest
+from app.services.render_executor import RenderExecutor
+
+
+def crash(progress_queue=None):
+    # Stand-in for a render process killed mid-render
+    os._exit(1)
+
+
+def render(value, progress_queue=None):
+    if progress_queue is not None:
+        progress_queue.put(100)
+    return value * 2
+
+
+def test_run_returns_result_and_reports_progress():
+    executor = RenderExecutor(max_workers=1)
+    reported = []
+    try:
+        assert asyncio.run(executor.run(render, 21, progress_callback=reported.append)) == 42
+    finally:
+        executor.shutdown()
+    assert reported == [100]
+
+
+def test_pool_is_replaced_after_a_render_process_dies():
+    executor = RenderExecutor(max_workers=1)
+
+    async def scenario():
+        with pytest.raises(BrokenProcessPool):
+            await executor.run(crash)
+        assert executor._pool is None
+        return await executor.run(render, 5)
+
+    try:
+        assert asyncio.run(scenario()) == 10
+    finally:
+        executor.shutdown()
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+from app.utils.word_alignment import align_audio_clip, align_words, detect_speech_segments
+
+SAMPLE_RATE = 16000
+
+
+def synthetic_speech(*parts):
+    """
+    Mono PCM built from (kind, seconds) parts: "tone" is a 220 Hz sine, "silence" is zeros.
+    """
+    chunks = []
+    for kind, seconds in parts:
+        n = int(seconds * SAMPLE_RATE)
+        if kind == "tone":
+            t = np.arange(n) / SAMPLE_RATE
+            chunks.append(0.5 * np.sin(2 * np.pi * 220 * t))
+        else:
+            chunks.append(np.zeros(n))
+    return np.concatenate(chunks).astype(np.float32)
+
+
+def fixed_segments(segments):
+    # Stand-in for the silence detector: always reports the given speech segments
+    return lambda samples, sample_rate: list(segments)
+
+
+class FakeAudioClip:
+    def __init__(self, samples):
+        self.samples = samples
+
+    def to_soundarray(self, fps):
+        assert fps == SAMPLE_RATE
+        return np.stack([self.samples, self.samples], axis=1)
+
+
+def test_detects_speech_around_pauses():
+    samples = synthetic_speech(("silence", 0.2), ("tone", 0.5), ("silence", 0.3), ("tone", 0.7), ("silence", 0.1))
+    segments = detect_speech_segments(samples, SAMPLE_RATE)
+    assert len(segments) == 2
+    (start1, end1), (start2, end2) = segments
+    assert start1 == pytest.approx(0.2, abs=0.02)
+    assert end1 == pytest.approx(0.7, abs=0.02)
+    assert start2 == pytest.approx(1.0, abs=0.02)
+    assert end2 == pytest.approx(1.7, abs=0.02)
+
+
+def test_short_gaps_are_part_of_speech():
+    samples = synthetic_speech(("tone", 0.4), ("silence", 0.05), ("tone", 0.4))
+    assert len(detect_speech_segments(samples, SAMPLE_RATE)) == 1
+
+
+def test_silence_has_no_speech():
+    assert detect_speech_segments(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE) == []
+
+
+def test_words_snap_to_pauses_after_punctuation():
+    samples = np.zeros(3 * SAMPLE_RATE, dtype=np.float32)
+    detector = fixed_segments([(0.2, 1.0), (1.5, 2.8)])
+    timings = align_words("Hello there, how are you today?", samples, SAMPLE_RATE, detect_speech=detector)
+
+    assert [word for word, _, _ in timings] == ["Hello", "there,", "how", "are", "you", "today?"]
+    assert timings[0][1] == pytest.approx(0.2)
+    assert timings[1][2] == pytest.approx(1.0)
+    assert timings[2][1] == pytest.approx(1.5)
+    assert timings[-1][2] == pytest.approx(2.8)
+    for _, start, end in timings:
+        assert start < end
+        # No word straddles the pause
+        assert not (start < 1.0 < end or start < 1.5 < end)
+
+
+def test_timings_are_ordered_and_follow_synthetic_audio():
+    samples = synthetic_speech(("silence", 0.3), ("tone", 1.0), ("silence", 0.4), ("tone", 1.0))
+    timings = align_words("One two three. Four five six.", samples, SAMPLE_RATE)
+
+    ends = [end for _, _, end in timings]
+    starts = [start for _, start, _ in timings]
+    assert starts == sorted(starts) and ends == sorted(ends)
+    assert starts[0] == pytest.approx(0.3, abs=0.02)
+    assert timings[2][2] == pytest.approx(1.3, abs=0.02)
+    assert timings[3][1] == pytest.approx(1.7, abs=0.02)
+
+
+def test_falls_back_to_even_spread_without_speech():
+    samples = np.zeros(2 * SAMPLE_RATE, dtype=np.float32)
+    timings = align_words("a bb", samples, SAMPLE_RATE, detect_speech=fixed_segments([]))
+    assert timings[0][1] == 0.0
+    assert timings[-1][2] == pytest.approx(2.0)
+
+
+def test_align_audio_clip_uses_injected_detector():
+    clip = FakeAudioClip(np.zeros(2 * SAMPLE_RATE, dtype=np.float32))
+    timings = align_audio_clip("just words", clip, detect_speech=fixed_segments([(0.5, 1.5)]))
+    assert timings[0][1] == pytest.approx(0.5)
+    assert timings[-1][2] == pytest.approx(1.5)